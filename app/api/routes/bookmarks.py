@@ -7,26 +7,43 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from app.models.bookmark import (
     Bookmark,
     BookmarkCreate,
+    BookmarkOrderBy,
     BookmarkUpdate,
     PaginatedBookmarksResponse,
+    SortOrder,
 )
 from app.services import bookmark_service
 from app.services.bookmark_service import DuplicateBookmarkError
-from app.services.database import get_db
+from app.services.database import get_db_connection, get_read_db
+from app.utils import ORJSONResponse
 
 router = APIRouter()
 
 
+# Write handlers are plain def and take the writer connection themselves, so
+# the writer lock is held only for the statement and commit, on one
+# threadpool thread, rather than for the whole request
 @router.post("", response_model=Bookmark, status_code=201)
-async def create_bookmark(
-    data: BookmarkCreate,
-    db: Connection = Depends(get_db),
-):
+def create_bookmark(data: BookmarkCreate):
     """Create a new bookmark."""
     try:
-        return bookmark_service.create_bookmark(db, data)
+        with get_db_connection() as db:
+            bookmark = bookmark_service.create_bookmark(db, data)
     except DuplicateBookmarkError as e:
         raise HTTPException(status_code=409, detail=str(e)) from e
+    return ORJSONResponse(bookmark.model_dump(), status_code=201)
+
+
+@router.post("/bulk", response_model=list[Bookmark], status_code=201)
+def create_bookmarks_bulk(items: list[BookmarkCreate]):
+    """Create many bookmarks in one transaction.
+
+    Events that are already bookmarked are returned unchanged rather than
+    failing the batch.
+    """
+    with get_db_connection() as db:
+        bookmarks = bookmark_service.create_bookmarks_bulk(db, items)
+    return ORJSONResponse([b.model_dump() for b in bookmarks], status_code=201)
 
 
 @router.get("", response_model=PaginatedBookmarksResponse)
@@ -37,9 +54,10 @@ async def list_bookmarks(
     search: str | None = Query(None),
     offset: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
-    order_by: str = Query("created_at"),
-    order: str = Query("desc"),
-    db: Connection = Depends(get_db),
+    order_by: BookmarkOrderBy = Query("created_at"),
+    order: SortOrder = Query("desc"),
+    exact_total: bool = Query(True),
+    db: Connection = Depends(get_read_db),
 ):
     """List bookmarks with optional filtering."""
     bookmarks, total = bookmark_service.list_bookmarks(
@@ -52,48 +70,44 @@ async def list_bookmarks(
         limit=limit,
         order_by=order_by,
         order=order,
+        exact_total=exact_total,
     )
-    return PaginatedBookmarksResponse(
-        data=bookmarks,
-        total=total,
-        offset=offset,
-        limit=limit,
-        has_more=(offset + limit) < total,
-    )
+    return ORJSONResponse({
+        "data": [b.model_dump() for b in bookmarks],
+        "total": total if exact_total else None,
+        "offset": offset,
+        "limit": limit,
+        "has_more": (offset + limit) < total,
+    })
 
 
 @router.get("/{bookmark_id}", response_model=Bookmark)
 async def get_bookmark(
     bookmark_id: int,
-    db: Connection = Depends(get_db),
+    db: Connection = Depends(get_read_db),
 ):
     """Get a specific bookmark."""
     bookmark = bookmark_service.get_bookmark(db, bookmark_id)
     if not bookmark:
         raise HTTPException(status_code=404, detail="Bookmark not found")
-    return bookmark
+    return ORJSONResponse(bookmark.model_dump())
 
 
 @router.put("/{bookmark_id}", response_model=Bookmark)
-async def update_bookmark(
-    bookmark_id: int,
-    data: BookmarkUpdate,
-    db: Connection = Depends(get_db),
-):
+def update_bookmark(bookmark_id: int, data: BookmarkUpdate):
     """Update a bookmark."""
-    bookmark = bookmark_service.update_bookmark(db, bookmark_id, data)
+    with get_db_connection() as db:
+        bookmark = bookmark_service.update_bookmark(db, bookmark_id, data)
     if not bookmark:
         raise HTTPException(status_code=404, detail="Bookmark not found")
-    return bookmark
+    return ORJSONResponse(bookmark.model_dump())
 
 
 @router.delete("/{bookmark_id}", status_code=204)
-async def delete_bookmark(
-    bookmark_id: int,
-    db: Connection = Depends(get_db),
-):
+def delete_bookmark(bookmark_id: int):
     """Delete a bookmark."""
-    deleted = bookmark_service.delete_bookmark(db, bookmark_id)
+    with get_db_connection() as db:
+        deleted = bookmark_service.delete_bookmark(db, bookmark_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Bookmark not found")
 
@@ -101,17 +115,16 @@ async def delete_bookmark(
 @router.get("/session/{session_id}", response_model=list[Bookmark])
 async def get_session_bookmarks(
     session_id: str,
-    db: Connection = Depends(get_db),
+    db: Connection = Depends(get_read_db),
 ):
     """Get all bookmarks for a session."""
-    return bookmark_service.get_session_bookmarks(db, session_id)
+    bookmarks = bookmark_service.get_session_bookmarks(db, session_id)
+    return ORJSONResponse([b.model_dump() for b in bookmarks])
 
 
 @router.delete("/session/{session_id}")
-async def delete_session_bookmarks(
-    session_id: str,
-    db: Connection = Depends(get_db),
-):
+def delete_session_bookmarks(session_id: str):
     """Delete all bookmarks for a session."""
-    count = bookmark_service.delete_session_bookmarks(db, session_id)
+    with get_db_connection() as db:
+        count = bookmark_service.delete_session_bookmarks(db, session_id)
     return {"status": "ok", "deleted": count}
@@ -1,23 +1,66 @@
 """Export API routes."""
 
+from collections.abc import Callable, Iterable
+from pathlib import Path
 
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
 
-from app.services.export_service import generate_markdown
-from app.services.session_indexer import session_indexer
+from app.config import settings
+from app.services.export_service import get_cached_export, iter_markdown
+from app.services.session_indexer import get_session_indexer
 
 router = APIRouter()
 
 
+def _cached_export_response(
+    request: Request,
+    session_id: str,
+    file_path: str,
+    variant: str,
+    render: Callable[[], Iterable[str | bytes]],
+    media_type: str,
+    filename: str,
+) -> FileResponse | None:
+    """Serve a large session's export from the gzip disk cache.
+
+    Returns None when the client doesn't accept gzip, the session is below
+    the caching threshold, or the export couldn't be cached.
+    """
+    if "gzip" not in request.headers.get("accept-encoding", ""):
+        return None
+    try:
+        if Path(file_path).stat().st_size < settings.export_cache_min_bytes:
+            return None
+    except OSError:
+        return None
+
+    path = get_cached_export(session_id, file_path, variant, render)
+    if path is None:
+        return None
+
+    return FileResponse(
+        path,
+        media_type=media_type,
+        headers={
+            "Content-Encoding": "gzip",
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Vary": "Accept-Encoding",
+        },
+    )
+
+
+# Plain def handlers: a cache miss gzips the whole export, which must run in
+# the threadpool rather than on the event loop
 @router.get("/{session_id}/markdown")
-async def export_markdown(
+def export_markdown(
+    request: Request,
     session_id: str,
     include_thinking: bool = Query(False),
     verbose: bool = Query(False),
 ):
     """Export session as markdown."""
-    session = session_indexer.get_session_by_id(
+    session = get_session_indexer().get_session_by_id(
         session_id,
         include_thinking=include_thinking,
     )
@@ -25,10 +68,20 @@ async def export_markdown(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    markdown = generate_markdown(session, include_thinking=include_thinking, verbose=verbose)
+    cached = _cached_export_response(
+        request,
+        session_id,
+        session.file_path,
+        variant=f"{int(include_thinking)}{int(verbose)}.md",
+        render=lambda: iter_markdown(session, include_thinking=include_thinking, verbose=verbose),
+        media_type="text/markdown",
+        filename=f"{session_id}.md",
+    )
+    if cached:
+        return cached
 
-    return PlainTextResponse(
-        content=markdown,
+    return StreamingResponse(
+        iter_markdown(session, include_thinking=include_thinking, verbose=verbose),
         media_type="text/markdown",
         headers={
             "Content-Disposition": f'attachment; filename="{session_id}.md"'
@@ -37,21 +90,37 @@ async def export_markdown(
 
 
 @router.get("/{session_id}/json")
-async def export_json(
+def export_json(
+    request: Request,
     session_id: str,
     include_thinking: bool = Query(False),
 ):
     """Export session as JSON."""
-    session = session_indexer.get_session_by_id(
+    result = get_session_indexer().get_session_json(
         session_id,
         include_thinking=include_thinking,
     )
 
-    if not session:
+    if result is None:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    return JSONResponse(
-        content=session.model_dump(mode="json"),
+    payload, file_path = result
+    cached = _cached_export_response(
+        request,
+        session_id,
+        file_path,
+        variant=f"{int(include_thinking)}.json",
+        render=lambda: [payload],
+        media_type="application/json",
+        filename=f"{session_id}.json",
+    )
+    if cached:
+        return cached
+
+    # Already serialized (and cached) by the indexer
+    return Response(
+        content=payload,
+        media_type="application/json",
         headers={
             "Content-Disposition": f'attachment; filename="{session_id}.json"'
         }
@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter
 
-from app.services.session_indexer import session_indexer
+from app.services.session_indexer import get_session_indexer
 
 router = APIRouter()
 
@@ -10,5 +10,5 @@ router = APIRouter()
 @router.get("")
 async def list_projects():
     """List all Claude Code projects."""
-    projects = session_indexer.get_projects()
+    projects = get_session_indexer().get_projects()
     return {"data": projects, "total": len(projects)}
@@ -2,17 +2,20 @@
 
 from datetime import datetime
 
+import orjson
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response
 
 from app.config import settings
 from app.models.session import PaginatedResponse
-from app.services.log_parser import extract_file_changes
-from app.services.session_indexer import session_indexer
+from app.services.session_db import decode_session_cursor, encode_session_cursor
+from app.services.session_indexer import get_session_indexer
+from app.utils import ORJSONResponse
 
 router = APIRouter()
 
 
-@router.get("")
+@router.get("", response_model=PaginatedResponse)
 async def list_sessions(
     project: str | None = Query(None, description="Filter by project encoded name"),
     date_from: datetime | None = Query(None, description="Filter sessions from this date"),
@@ -27,26 +30,54 @@ async def list_sessions(
     ),
     order_by: str = Query("start_time", description="Sort field (start_time, duration_seconds, message_count)"),
     order: str = Query("desc", description="Sort order (asc or desc)"),
+    exact_total: bool = Query(True, description="Compute total count (total is null if false)"),
+    cursor: str | None = Query(
+        None,
+        description="Resume after this next_cursor from a previous page instead of using offset "
+        "(start_time ordering only)",
+    ),
 ):
     """List sessions with optional filtering and pagination."""
-    sessions, total = session_indexer.get_sessions(
+    if cursor is not None:
+        if order_by != "start_time":
+            raise HTTPException(status_code=400, detail="cursor requires order_by=start_time")
+        try:
+            decode_session_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+
+    sessions, total = get_session_indexer().get_sessions(
         project=project,
         date_from=date_from,
         date_to=date_to,
         search=search,
         offset=offset,
-        limit=limit,
+        # A cursor page has no offset to compare with total, so look ahead one
+        # row; get_sessions adds no lookahead of its own for cursor pages
+        limit=limit + 1 if cursor is not None else limit,
         order_by=order_by,
         order=order,
+        exact_total=exact_total,
+        cursor=cursor,
     )
-
-    return PaginatedResponse(
-        data=[s.model_dump() for s in sessions],
-        total=total,
-        offset=offset,
-        limit=limit,
-        has_more=(offset + limit) < total,
-    )
+    if cursor is not None:
+        has_more = len(sessions) > limit
+        sessions = sessions[:limit]
+    else:
+        has_more = (offset + limit) < total
+
+    return ORJSONResponse({
+        "data": [s.model_dump() for s in sessions],
+        "total": total if exact_total else None,
+        "offset": offset,
+        "limit": limit,
+        "has_more": has_more,
+        "next_cursor": (
+            encode_session_cursor(sessions[-1])
+            if has_more and order_by == "start_time"
+            else None
+        ),
+    })
 
 
 @router.get("/{session_id}")
@@ -55,18 +86,20 @@ async def get_session(
     include_thinking: bool = Query(False, description="Include thinking blocks"),
 ):
     """Get full session details by ID."""
-    session = session_indexer.get_session_by_id(
+    result = get_session_indexer().get_session_json(
         session_id,
         include_thinking=include_thinking,
     )
 
-    if not session:
+    if result is None:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    return session
+    # Already serialized (and cached) by the indexer
+    payload, _ = result
+    return Response(content=payload, media_type="application/json")
 
 
-@router.get("/{session_id}/timeline")
+@router.get("/{session_id}/timeline", response_model=PaginatedResponse)
 async def get_session_timeline(
     session_id: str,
     include_thinking: bool = Query(False, description="Include thinking blocks"),
@@ -75,83 +108,67 @@ async def get_session_timeline(
     limit: int = Query(50, ge=1, le=200),
 ):
     """Get paginated timeline events for a session."""
-    session = session_indexer.get_session_by_id(
+    result = get_session_indexer().get_timeline(
         session_id,
+        event_types=event_types,
+        offset=offset,
+        limit=limit,
         include_thinking=include_thinking,
     )
 
-    if not session:
+    if result is None:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    events = session.events
-
-    # Filter by event types if specified
-    if event_types:
-        events = [e for e in events if e.type in event_types]
-
-    total = len(events)
-    paginated = events[offset:offset + limit]
+    events, total = result
 
-    return PaginatedResponse(
-        data=[e.model_dump() for e in paginated],
-        total=total,
-        offset=offset,
-        limit=limit,
-        has_more=(offset + limit) < total,
-    )
+    return ORJSONResponse({
+        # Embed each event's cached JSON instead of re-dumping the models
+        "data": [orjson.Fragment(e.to_json_bytes()) for e in events],
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "has_more": (offset + limit) < total,
+    })
 
 
 @router.get("/{session_id}/files")
 async def get_session_files(session_id: str):
     """Get files touched in a session."""
-    session = session_indexer.get_session_by_id(session_id)
+    session = get_session_indexer().get_session_by_id(session_id)
 
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    file_changes = extract_file_changes(session)
-
-    # Group by file path
-    files_map: dict[str, dict] = {}
-    for change in file_changes:
-        if change.file_path not in files_map:
-            files_map[change.file_path] = {
-                "path": change.file_path,
-                "operations": [],
-            }
-        files_map[change.file_path]["operations"].append({
-            "type": change.operation,
-            "timestamp": change.timestamp.isoformat() if change.timestamp else None,
-        })
-
-    return {
+    return ORJSONResponse({
         "files_modified": session.files_modified,
         "files_read": session.files_read,
-        "changes": list(files_map.values()),
-    }
+        "changes": [group.model_dump() for group in session.files],
+    })
 
 
 @router.get("/{session_id}/file-changes/{file_path:path}")
 async def get_file_changes(session_id: str, file_path: str):
     """Get all changes to a specific file in a session."""
-    session = session_indexer.get_session_by_id(session_id)
+    changes_by_path = get_session_indexer().get_file_changes(session_id)
 
-    if not session:
+    if changes_by_path is None:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    file_changes = extract_file_changes(session)
-    changes = [c for c in file_changes if c.file_path == f"/{file_path}" or c.file_path == file_path]
+    # The path param loses its leading slash, so match both spellings
+    absolute = changes_by_path.get(f"/{file_path}")
+    relative = changes_by_path.get(file_path)
+    changes = absolute + relative if absolute and relative else absolute or relative or []
 
-    return {
+    return ORJSONResponse({
         "file_path": file_path,
         "changes": [c.model_dump() for c in changes],
-    }
+    })
 
 
 @router.post("/cache/clear")
 async def clear_cache():
     """Clear the session cache and sync new/stale sessions."""
-    session_indexer.clear_cache()
+    get_session_indexer().clear_cache()
     return {"status": "ok", "message": "Cache cleared"}
 
 
@@ -169,7 +186,7 @@ async def rebuild_index():
         import time
         start_time = time.time()
 
-        count = session_indexer.rebuild_index()
+        count = get_session_indexer().rebuild_index()
         elapsed = time.time() - start_time
 
         return {
@@ -190,4 +207,4 @@ async def get_index_stats():
 
     Returns information about the index status, session count, and configuration.
     """
-    return session_indexer.get_index_stats()
+    return get_session_indexer().get_index_stats()
@@ -1,6 +1,7 @@
 """Upload API routes."""
 
-import uuid
+import secrets
+from pathlib import Path
 
 import aiofiles
 from fastapi import APIRouter, File, HTTPException, UploadFile
@@ -10,32 +11,53 @@ from app.services.log_parser import get_session_detail
 
 router = APIRouter()
 
+# Read uploads in fixed-size chunks so large files never sit fully in memory
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB
+
 
 @router.post("")
 async def upload_jsonl(file: UploadFile = File(...)):
     """Upload a JSONL file for analysis."""
-    if not file.filename or not file.filename.endswith(".jsonl"):
+    # Drop any client-supplied directory components to prevent path traversal
+    filename = Path(file.filename).name if file.filename else ""
+    if not filename.endswith(".jsonl"):
         raise HTTPException(
             status_code=400,
             detail="File must be a .jsonl file"
         )
 
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"File exceeds maximum upload size of {settings.max_upload_bytes} bytes"
+    )
+    if file.size is not None and file.size > settings.max_upload_bytes:
+        raise too_large
+
     # Generate unique filename
-    unique_id = str(uuid.uuid4())[:8]
-    safe_filename = f"{unique_id}_{file.filename}"
-    file_path = settings.upload_dir / safe_filename
+    file_path = settings.upload_dir / f"{secrets.token_hex(4)}_{filename}"
 
-    # Save the file
+    # Stream the file to disk, stopping early if it grows past the limit
+    exceeded = False
     try:
+        size = 0
         async with aiofiles.open(file_path, "wb") as f:
-            content = await file.read()
-            await f.write(content)
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > settings.max_upload_bytes:
+                    exceeded = True
+                    break
+                await f.write(chunk)
     except Exception as e:
+        file_path.unlink(missing_ok=True)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to save file: {str(e)}"
         ) from e
 
+    if exceeded:
+        file_path.unlink(missing_ok=True)
+        raise too_large
+
     # Parse and return session details
     try:
         session = get_session_detail(
@@ -14,6 +14,14 @@ class Settings(BaseSettings):
     # Uploaded files directory
     upload_dir: Path = Path.home() / ".claude-log-converter" / "uploads"
 
+    # Maximum accepted upload size
+    max_upload_bytes: int = 512 * 1024 * 1024  # 512 MB
+
+    # Session files at least this large have their exports cached gzipped on disk
+    export_cache_min_bytes: int = 1024 * 1024  # 1 MB
+    # Total size of the export cache; least recently used exports are evicted
+    export_cache_max_bytes: int = 512 * 1024 * 1024  # 512 MB
+
     # SQLite database path (sessions index)
     db_path: Path = Path.home() / ".claude-log-converter" / "sessions.db"
 
@@ -27,6 +35,12 @@ class Settings(BaseSettings):
     cache_ttl_seconds: int = 300  # 5 minutes
     cache_max_size: int = 100
 
+    # Loaded sessions kept in memory, bounded by their JSONL file sizes
+    session_cache_max_bytes: int = 256 * 1024 * 1024  # 256 MB
+    # Serialized session JSON and timeline pages, bounded by encoded size
+    session_json_cache_max_bytes: int = 128 * 1024 * 1024  # 128 MB
+    timeline_cache_max_bytes: int = 32 * 1024 * 1024  # 32 MB
+
     # Pagination defaults
     default_page_size: int = 20
     max_page_size: int = 100
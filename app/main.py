@@ -9,11 +9,13 @@ from fastapi.staticfiles import StaticFiles
 
 from app.api.routes import bookmarks, export, projects, sessions, upload
 from app.services.database import init_database
+from app.utils import ORJSONResponse
 
 app = FastAPI(
     title="Claude Log Converter",
     description="Web interface for browsing and analyzing Claude Code sessions",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware (only needed for Vite dev server during development)
@@ -12,10 +12,12 @@ Configure in Claude Code:
 """
 
 import asyncio
+import json
 import logging
-import re
 import sqlite3
 import sys
+import threading
+from collections.abc import Callable
 from datetime import datetime
 
 from mcp.server import Server
@@ -24,10 +26,16 @@ from mcp.types import TextContent, Tool
 
 from app.config import settings
 from app.models.bookmark import Bookmark, BookmarkCreate
+from app.models.session import SessionMetadata
 from app.services import bookmark_service
-from app.services.database import get_db_connection, init_database
+from app.services.database import (
+    get_db_connection,
+    get_read_connection,
+    init_database,
+)
 from app.services.export_service import format_date, generate_markdown
-from app.services.session_indexer import session_indexer
+from app.services.session_db import CONNECTION_PRAGMAS, build_fts5_query
+from app.services.session_indexer import get_session_indexer
 
 # Configure logging to stderr (stdout reserved for MCP protocol)
 logging.basicConfig(
@@ -326,24 +334,10 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     logger.info(f"Tool called: {name} with args: {arguments}")
 
     try:
-        if name == "search_sessions":
-            result = await handle_search_sessions(arguments)
-        elif name == "get_session":
-            result = await handle_get_session(arguments)
-        elif name == "list_projects":
-            result = await handle_list_projects(arguments)
-        elif name == "list_sessions":
-            result = await handle_list_sessions(arguments)
-        elif name == "list_bookmarks":
-            result = await handle_list_bookmarks(arguments)
-        elif name == "create_bookmark":
-            result = await handle_create_bookmark(arguments)
-        elif name == "delete_bookmark":
-            result = await handle_delete_bookmark(arguments)
-        elif name == "get_session_summary":
-            result = await handle_get_session_summary(arguments)
-        elif name == "search_in_session":
-            result = await handle_search_in_session(arguments)
+        handler = _HANDLERS.get(name)
+        if handler:
+            # Handlers do blocking SQLite and file I/O; keep the event loop free
+            result = await asyncio.to_thread(handler, arguments)
         else:
             result = f"Unknown tool: {name}"
 
@@ -354,23 +348,45 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         return [TextContent(type="text", text=f"Error: {str(e)}")]
 
 
+# =============================================================================
+# Argument Helpers
+# =============================================================================
+
+
+def _clamped_arg(args: dict, key: str, default: int, maximum: int) -> int:
+    """Read an optional integer tool argument, capped at maximum."""
+    value = args.get(key)
+    return min(default if value is None else value, maximum)
+
+
+def _date_arg(args: dict, key: str) -> datetime | None:
+    """Read an optional ISO date tool argument, ignoring unparseable values."""
+    value = args.get(key)
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
 # =============================================================================
 # Tool Handlers
 # =============================================================================
 
 
-async def handle_search_sessions(args: dict) -> str:
+def handle_search_sessions(args: dict) -> str:
     """Search sessions using FTS5 full-text search."""
     query = args["query"]
     cwd = args.get("cwd")
     scope = args.get("scope", "project")
     explicit_project = args.get("project")
-    limit = min(args.get("limit", 10), 50)
+    limit = _clamped_arg(args, "limit", default=10, maximum=50)
 
     # Resolve project filter from cwd/scope/explicit
     project, scope_desc = resolve_project_filter(cwd, scope, explicit_project)
 
-    sessions, total = session_indexer.get_sessions(
+    sessions, total = get_session_indexer().get_sessions(
         search=query,
         project=project,
         limit=limit,
@@ -386,12 +402,12 @@ async def handle_search_sessions(args: dict) -> str:
     )
 
 
-async def handle_get_session(args: dict) -> str:
+def handle_get_session(args: dict) -> str:
     """Get full session details."""
     session_id = args["session_id"]
     include_thinking = args.get("include_thinking", False)
 
-    session = session_indexer.get_session_by_id(session_id, include_thinking)
+    session = get_session_indexer().get_session_by_id(session_id, include_thinking)
 
     if not session:
         return f"Session not found: {session_id}"
@@ -399,9 +415,9 @@ async def handle_get_session(args: dict) -> str:
     return generate_markdown(session, include_thinking=include_thinking)
 
 
-async def handle_list_projects(args: dict) -> str:
+def handle_list_projects(args: dict) -> str:
     """List all projects."""
-    projects = session_indexer.get_projects()
+    projects = get_session_indexer().get_projects()
 
     if not projects:
         return "No projects found."
@@ -415,33 +431,21 @@ async def handle_list_projects(args: dict) -> str:
     return "\n".join(lines)
 
 
-async def handle_list_sessions(args: dict) -> str:
+def handle_list_sessions(args: dict) -> str:
     """List recent sessions with optional filters."""
     cwd = args.get("cwd")
     scope = args.get("scope", "project")
     explicit_project = args.get("project")
-    limit = min(args.get("limit", 10), 50)
+    limit = _clamped_arg(args, "limit", default=10, maximum=50)
 
     # Resolve project filter from cwd/scope/explicit
     project, scope_desc = resolve_project_filter(cwd, scope, explicit_project)
 
     # Parse dates if provided
-    date_from = None
-    date_to = None
-
-    if "date_from" in args and args["date_from"]:
-        try:
-            date_from = datetime.fromisoformat(args["date_from"])
-        except ValueError:
-            pass
-
-    if "date_to" in args and args["date_to"]:
-        try:
-            date_to = datetime.fromisoformat(args["date_to"])
-        except ValueError:
-            pass
+    date_from = _date_arg(args, "date_from")
+    date_to = _date_arg(args, "date_to")
 
-    sessions, total = session_indexer.get_sessions(
+    sessions, total = get_session_indexer().get_sessions(
         project=project,
         date_from=date_from,
         date_to=date_to,
@@ -451,15 +455,15 @@ async def handle_list_sessions(args: dict) -> str:
     return format_session_list(sessions, total, scope_desc=scope_desc)
 
 
-async def handle_list_bookmarks(args: dict) -> str:
+def handle_list_bookmarks(args: dict) -> str:
     """List bookmarks with optional filters."""
     session_id = args.get("session_id")
     project = args.get("project")
     category = args.get("category")
     search = args.get("search")
-    limit = min(args.get("limit", 20), 100)
+    limit = _clamped_arg(args, "limit", default=20, maximum=100)
 
-    with get_db_connection() as conn:
+    with get_read_connection() as conn:
         bookmarks, total = bookmark_service.list_bookmarks(
             conn,
             session_id=session_id,
@@ -472,32 +476,24 @@ async def handle_list_bookmarks(args: dict) -> str:
     return format_bookmark_list(bookmarks, total)
 
 
-async def handle_create_bookmark(args: dict) -> str:
+def handle_create_bookmark(args: dict) -> str:
     """Create a new bookmark."""
-    # Get session info to populate denormalized fields
-    session = session_indexer.get_session_by_id(args["session_id"])
-
-    if not session:
-        return f"Session not found: {args['session_id']}"
-
-    # Find the event to get metadata
-    event = None
-    for e in session.events:
-        if e.id == args["event_id"]:
-            event = e
-            break
+    # Look up just the event/session fields the bookmark denormalizes
+    metadata = get_session_indexer().get_event_metadata(args["session_id"], args["event_id"])
 
-    if not event:
+    if not metadata:
+        if not get_session_indexer().get_session_by_id(args["session_id"]):
+            return f"Session not found: {args['session_id']}"
         return f"Event not found: {args['event_id']} in session {args['session_id']}"
 
     data = BookmarkCreate(
         session_id=args["session_id"],
         event_id=args["event_id"],
         event_index=args["event_index"],
-        project_name=session.project_name,
-        git_branch=session.git_branch,
-        event_timestamp=event.timestamp,
-        event_type=event.type,
+        project_name=metadata.project_name,
+        git_branch=metadata.git_branch,
+        event_timestamp=metadata.event_timestamp,
+        event_type=metadata.event_type,
         category=args.get("category", "general"),
         note=args.get("note"),
     )
@@ -510,7 +506,7 @@ async def handle_create_bookmark(args: dict) -> str:
         return "A bookmark already exists for this event."
 
 
-async def handle_delete_bookmark(args: dict) -> str:
+def handle_delete_bookmark(args: dict) -> str:
     """Delete a bookmark."""
     bookmark_id = args["bookmark_id"]
 
@@ -523,11 +519,11 @@ async def handle_delete_bookmark(args: dict) -> str:
         return f"Bookmark not found: {bookmark_id}"
 
 
-async def handle_get_session_summary(args: dict) -> str:
+def handle_get_session_summary(args: dict) -> str:
     """Get session summary without full conversation."""
     session_id = args["session_id"]
 
-    session = session_indexer.get_session_by_id(session_id, include_thinking=False)
+    session = get_session_indexer().get_session_metadata(session_id)
 
     if not session:
         return f"Session not found: {session_id}"
@@ -535,78 +531,110 @@ async def handle_get_session_summary(args: dict) -> str:
     return format_session_summary(session)
 
 
-async def handle_search_in_session(args: dict) -> str:
+def handle_search_in_session(args: dict) -> str:
     """Search within a specific session."""
     session_id = args["session_id"]
     query = args["query"]
-    context_events = min(args.get("context_events", 2), 5)
-    max_matches = min(args.get("max_matches", 10), 25)
+    context_events = _clamped_arg(args, "context_events", default=2, maximum=5)
+    max_matches = _clamped_arg(args, "max_matches", default=10, maximum=25)
 
-    session = session_indexer.get_session_by_id(session_id, include_thinking=False)
+    # Find matching events (in SQL when indexed), before loading the session
+    match_positions = get_session_indexer().search_session_events(session_id, query, max_matches)
 
-    if not session:
+    if match_positions is None:
         return f"Session not found: {session_id}"
 
-    # Find matching events
-    matches = []
-    query_lower = query.lower()
+    if not match_positions:
+        return f"No matches found for '{query}' in session {session_id[:8]}"
 
-    for i, event in enumerate(session.events):
-        content = event.content or ""
-        if query_lower in content.lower():
-            matches.append((i, event, content))
+    session = get_session_indexer().get_session_by_id(session_id, include_thinking=False)
 
-    if not matches:
-        return f"No matches found for '{query}' in session {session_id[:8]}"
+    if not session:
+        return f"Session not found: {session_id}"
 
-    # Limit matches
-    matches = matches[:max_matches]
+    matches = [
+        (i, session.events[i], session.events[i].content or "", match_pos)
+        for i, match_pos in match_positions
+        if i < len(session.events)
+    ]
 
     return format_session_search_results(
         session, matches, query, context_events, len(session.events)
     )
 
 
+# Tool name -> handler, used by call_tool
+_HANDLERS: dict[str, Callable[[dict], str]] = {
+    "search_sessions": handle_search_sessions,
+    "get_session": handle_get_session,
+    "list_projects": handle_list_projects,
+    "list_sessions": handle_list_sessions,
+    "list_bookmarks": handle_list_bookmarks,
+    "create_bookmark": handle_create_bookmark,
+    "delete_bookmark": handle_delete_bookmark,
+    "get_session_summary": handle_get_session_summary,
+    "search_in_session": handle_search_in_session,
+}
+
+
 # =============================================================================
 # Project Detection Helpers
 # =============================================================================
 
 
+# Normalized project paths, rebuilt whenever get_projects() returns a new list
+_project_paths_cache: tuple[list[dict], list[tuple[str, str, str]]] | None = None
+
+
+def _get_project_paths(projects: list[dict]) -> list[tuple[str, str, str]]:
+    """Get (path, path prefix, name) triples for projects."""
+    global _project_paths_cache
+
+    cached = _project_paths_cache
+    if cached and cached[0] is projects:
+        return cached[1]
+
+    paths = []
+    for p in projects:
+        project_path = p["decoded_path"].rstrip("/")
+        paths.append((project_path, project_path + "/", p["name"]))
+    _project_paths_cache = (projects, paths)
+    return paths
+
+
 def detect_project_from_cwd(cwd: str | None) -> str | None:
     """Detect project name from current working directory.
 
-    Matches cwd against known project paths to find the best match.
-    Returns project name if found, None otherwise.
+    Matches cwd against known project paths to find the best match: an exact
+    match, else the deepest project containing cwd, else (for monorepos) the
+    deepest project inside cwd. Returns project name if found, None otherwise.
     """
     if not cwd:
         return None
 
-    projects = session_indexer.get_projects()
+    projects = get_session_indexer().get_projects()
     if not projects:
         return None
 
     # Normalize cwd path
     cwd = cwd.rstrip("/")
+    cwd_prefix = cwd + "/"
 
-    # Try exact match first
-    for p in projects:
-        if p["decoded_path"].rstrip("/") == cwd:
-            return p["name"]
-
-    # Try matching cwd as subdirectory of project (cwd is inside project)
-    for p in projects:
-        project_path = p["decoded_path"].rstrip("/")
-        if cwd.startswith(project_path + "/") or cwd == project_path:
-            return p["name"]
-
-    # Try matching project as subdirectory of cwd (project is inside cwd)
-    # This handles monorepo scenarios
-    for p in projects:
-        project_path = p["decoded_path"].rstrip("/")
-        if project_path.startswith(cwd + "/"):
-            return p["name"]
+    # Single pass; best is (priority, path length, name), lower priority wins
+    best = None
+    for project_path, project_prefix, name in _get_project_paths(projects):
+        if cwd == project_path:
+            return name
+        if cwd.startswith(project_prefix):
+            # cwd is inside project
+            if not best or best[0] > 1 or len(project_path) > best[1]:
+                best = (1, len(project_path), name)
+        elif project_path.startswith(cwd_prefix):
+            # Project is inside cwd (monorepo)
+            if not best or (best[0] > 1 and len(project_path) > best[1]):
+                best = (2, len(project_path), name)
 
-    return None
+    return best[2] if best else None
 
 
 def resolve_project_filter(
@@ -641,6 +669,47 @@ def resolve_project_filter(
 # =============================================================================
 
 
+# Long-lived read connection to the sessions index, reused across snippet
+# queries. Tagged with the database file's inode so a deleted and rebuilt
+# sessions.db is picked up.
+_snippet_conn: sqlite3.Connection | None = None
+_snippet_conn_ino: int | None = None
+_snippet_conn_lock = threading.Lock()
+
+
+def _query_snippets(sql: str, params: tuple) -> list[tuple]:
+    """Run a query on the shared sessions index connection.
+
+    The connection is opened on first use and reopened when the database
+    file has been replaced or a query on it fails.
+    """
+    global _snippet_conn, _snippet_conn_ino
+
+    try:
+        ino = settings.db_path.stat().st_ino
+    except OSError:
+        ino = None
+
+    with _snippet_conn_lock:
+        if _snippet_conn is not None and _snippet_conn_ino != ino:
+            _snippet_conn.close()
+            _snippet_conn = None
+
+        if _snippet_conn is None:
+            conn = sqlite3.connect(settings.db_path, timeout=10.0, check_same_thread=False)
+            # Same tuning as the indexer's own connections
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            _snippet_conn, _snippet_conn_ino = conn, ino
+
+        try:
+            return _snippet_conn.execute(sql, params).fetchall()
+        except sqlite3.Error:
+            _snippet_conn.close()
+            _snippet_conn = None
+            raise
+
+
 def get_search_snippets(query: str, session_ids: list[str]) -> dict[str, str]:
     """Get matching content snippets for search results.
 
@@ -653,42 +722,44 @@ def get_search_snippets(query: str, session_ids: list[str]) -> dict[str, str]:
 
     try:
         # Auto-repair FTS5 if corrupted
-        session_indexer.repair_fts5_if_needed()
-
-        db_path = settings.db_path
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
+        get_session_indexer().repair_fts5_if_needed()
 
-        # Escape query for FTS5
-        query_escaped = '"' + query.replace('"', '""') + '"'
+        # Same FTS5 query the session search matched with
+        query_escaped = build_fts5_query(query)
 
-        # Get snippets using FTS5 snippet function
-        placeholders = ",".join("?" * len(session_ids))
-        sql = f"""
+        # Pick each session's best bm25-ranked match, then build snippets for
+        # just those rows (snippet() can't run under GROUP BY or a window).
+        # Session IDs are passed as one JSON array so the statement text (and
+        # its cached plan) is stable.
+        sql = """
             SELECT
                 session_id,
                 snippet(events_fts, 2, '**', '**', '...', 32) as snippet
             FROM events_fts
-            WHERE events_fts MATCH ?
-            AND session_id IN ({placeholders})
-            GROUP BY session_id
-            LIMIT 50
+            WHERE events_fts MATCH ?1
+            AND rowid IN (
+                SELECT rowid FROM (
+                    SELECT
+                        rowid,
+                        ROW_NUMBER() OVER (PARTITION BY session_id ORDER BY rank) AS best
+                    FROM events_fts
+                    WHERE events_fts MATCH ?1
+                    AND session_id IN (SELECT value FROM json_each(?2))
+                )
+                WHERE best = 1
+            )
         """
 
-        params = [query_escaped] + session_ids
-        cursor = conn.execute(sql, params)
+        rows = _query_snippets(sql, (query_escaped, json.dumps(session_ids)))
 
-        for row in cursor:
+        for session_id, snippet in rows:
             # Clean up snippet - remove excessive whitespace
-            snippet = row["snippet"]
             if snippet:
-                snippet = re.sub(r"\s+", " ", snippet).strip()
+                snippet = " ".join(snippet.split())
                 # Limit length
                 if len(snippet) > 200:
                     snippet = snippet[:200] + "..."
-                snippets[row["session_id"]] = snippet
-
-        conn.close()
+                snippets[session_id] = snippet
 
     except Exception as e:
         logger.warning(f"Failed to get search snippets: {e}")
@@ -749,7 +820,7 @@ def format_session_list(
     return "\n".join(lines)
 
 
-def format_session_summary(session) -> str:
+def format_session_summary(session: SessionMetadata) -> str:
     """Format session summary without conversation (metadata only)."""
     lines = []
 
@@ -771,7 +842,7 @@ def format_session_summary(session) -> str:
         minutes = session.duration_seconds // 60
         seconds = session.duration_seconds % 60
         lines.append(f"- **Duration:** {minutes}m {seconds}s")
-    lines.append(f"- **Total Events:** {len(session.events)}")
+    lines.append(f"- **Total Events:** {session.event_count}")
     lines.append(f"- **Session ID:** `{session.session_id}`")
     lines.append("")
 
@@ -786,8 +857,7 @@ def format_session_summary(session) -> str:
     if session.files_modified:
         lines.append(f"## Files Modified ({len(session.files_modified)})")
         lines.append("")
-        for f in session.files_modified[:20]:
-            lines.append(f"- `{f}`")
+        lines.extend(f"- `{f}`" for f in session.files_modified[:20])
         if len(session.files_modified) > 20:
             lines.append(f"- _...and {len(session.files_modified) - 20} more_")
         lines.append("")
@@ -796,8 +866,7 @@ def format_session_summary(session) -> str:
     if session.files_read:
         lines.append(f"## Files Read ({len(session.files_read)})")
         lines.append("")
-        for f in session.files_read[:15]:
-            lines.append(f"- `{f}`")
+        lines.extend(f"- `{f}`" for f in session.files_read[:15])
         if len(session.files_read) > 15:
             lines.append(f"- _...and {len(session.files_read) - 15} more_")
         lines.append("")
@@ -806,8 +875,7 @@ def format_session_summary(session) -> str:
     if session.phases:
         lines.append("## Phases/Plans Detected")
         lines.append("")
-        for phase in session.phases[:15]:
-            lines.append(f"- {phase}")
+        lines.extend(f"- {phase}" for phase in session.phases[:15])
         if len(session.phases) > 15:
             lines.append(f"- _...and {len(session.phases) - 15} more_")
         lines.append("")
@@ -816,8 +884,7 @@ def format_session_summary(session) -> str:
     if session.decisions:
         lines.append("## Key Decisions")
         lines.append("")
-        for decision in session.decisions[:15]:
-            lines.append(f"- {decision}")
+        lines.extend(f"- {decision}" for decision in session.decisions[:15])
         if len(session.decisions) > 15:
             lines.append(f"- _...and {len(session.decisions) - 15} more_")
         lines.append("")
@@ -832,7 +899,12 @@ def format_session_search_results(
     context_events: int,
     total_events: int,
 ) -> str:
-    """Format search results within a session."""
+    """Format search results within a session.
+
+    Each match is an (event index, event, content, match offset) tuple, in
+    ascending event order; the offset locates the query in the content
+    without lowercasing it again.
+    """
     lines = []
 
     short_id = session.session_id[:8]
@@ -848,35 +920,38 @@ def format_session_search_results(
     lines.append("")
 
     events = session.events
+    num_events = len(events)
+    query_lower = query.lower()
+    query_len = len(query)
+    match_positions = {event_idx: match_pos for event_idx, _, _, match_pos in matches}
 
-    # Track which events we've already shown to avoid duplicates
-    shown_events = set()
+    # Matches are in event order, so every event before shown_until has
+    # already been shown; overlapping context windows only add the new tail
+    shown_until = 0
 
-    for match_idx, (event_idx, _event, _content) in enumerate(matches):
+    for match_idx, (event_idx, _event, _content, _match_pos) in enumerate(matches):
         lines.append(f"## Match {match_idx + 1} (Event {event_idx})")
         lines.append("")
 
-        # Calculate context range
-        start_idx = max(0, event_idx - context_events)
-        end_idx = min(len(events), event_idx + context_events + 1)
+        # Calculate context range, skipping events already shown (except the
+        # match itself, which is always repeated)
+        start_idx = max(0, event_idx - context_events, shown_until)
+        end_idx = min(num_events, event_idx + context_events + 1)
+        indices = range(start_idx, end_idx)
+        if event_idx < start_idx:
+            indices = [event_idx, *indices]
+        shown_until = max(shown_until, end_idx)
 
         # Show context events
-        for i in range(start_idx, end_idx):
-            if i in shown_events and i != event_idx:
-                continue
-            shown_events.add(i)
-
+        for i in indices:
             ctx_event = events[i]
-            is_match = i == event_idx
-
-            # Format event header
-            prefix = ">>> " if is_match else "    "
             event_type = ctx_event.type.upper()
 
-            if is_match:
+            # Format event header
+            if i == event_idx:
                 lines.append(f"**[{event_type}] (Event {i}) - MATCH:**")
             else:
-                lines.append(f"_{prefix}[{event_type}] (Event {i}):_")
+                lines.append(f"_    [{event_type}] (Event {i}):_")
 
             # Format content with highlighting for matches
             event_content = ctx_event.content or ""
@@ -884,23 +959,21 @@ def format_session_search_results(
                 # Truncate long content
                 if len(event_content) > 500:
                     # Try to show the matching part
-                    query_lower = query.lower()
-                    content_lower = event_content.lower()
-                    match_pos = content_lower.find(query_lower)
+                    match_pos = match_positions.get(i)
+                    if match_pos is None:
+                        match_pos = event_content.lower().find(query_lower)
                     if match_pos >= 0:
                         start = max(0, match_pos - 200)
-                        end = min(len(event_content), match_pos + len(query) + 200)
+                        end = min(len(event_content), match_pos + query_len + 200)
                         event_content = "..." + event_content[start:end] + "..."
                     else:
                         event_content = event_content[:500] + "..."
 
-                lines.append("")
-                lines.append(event_content)
+                lines.extend(("", event_content))
 
             lines.append("")
 
-        lines.append("---")
-        lines.append("")
+        lines.extend(("---", ""))
 
     return "\n".join(lines)
 
@@ -946,7 +1019,7 @@ async def main():
     logger.info(f"Database initialized at {settings.bookmark_db_path}")
 
     # Log index status
-    stats = session_indexer.get_index_stats()
+    stats = get_session_indexer().get_index_stats()
     logger.info(f"Session index: {stats.get('session_count', 0)} sessions indexed")
 
     # Run stdio server
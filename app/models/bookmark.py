@@ -1,8 +1,13 @@
 """Bookmark-related Pydantic models."""
 
 from datetime import datetime
+from typing import Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+
+# Sortable bookmark columns and directions (validated at request parsing time)
+BookmarkOrderBy = Literal["created_at", "updated_at", "event_timestamp", "id"]
+SortOrder = Literal["asc", "desc"]
 
 
 class BookmarkCreate(BaseModel):
@@ -29,6 +34,9 @@ class BookmarkUpdate(BaseModel):
 class Bookmark(BaseModel):
     """Bookmark model."""
 
+    # Built in bulk from rows and never modified afterwards
+    model_config = ConfigDict(frozen=True, defer_build=True)
+
     id: int
     session_id: str
     event_id: str
@@ -47,7 +55,7 @@ class PaginatedBookmarksResponse(BaseModel):
     """Paginated bookmarks response."""
 
     data: list[Bookmark]
-    total: int
+    total: int | None  # None when the caller skipped the exact count
     offset: int
     limit: int
     has_more: bool
@@ -2,12 +2,22 @@
 
 from datetime import datetime
 
-from pydantic import BaseModel, Field
+import orjson
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from app.utils.orjson_response import ORJSON_OPTIONS
+
+# For models built in bulk and never modified after construction: frozen
+# instances can't drift from cached serializations, and deferring the schema
+# build keeps validator construction off the import path
+HOT_MODEL_CONFIG = ConfigDict(frozen=True, defer_build=True)
 
 
 class SessionSummary(BaseModel):
     """Lightweight session info for listing."""
 
+    model_config = HOT_MODEL_CONFIG
+
     session_id: str
     project_path: str
     project_name: str
@@ -41,11 +51,35 @@ class SessionDetail(BaseModel):
     phases: list[str] = Field(default_factory=list)
     decisions: list[str] = Field(default_factory=list)
     events: list["TimelineEvent"] = Field(default_factory=list)
+    # Derived from events at load time; served by the /files endpoint only
+    files: list["FileGroup"] = Field(default_factory=list, exclude=True)
+
+
+class SessionMetadata(BaseModel):
+    """Session details and aggregates without the events themselves."""
+
+    session_id: str
+    project_path: str
+    project_name: str
+    file_path: str
+    cwd: str | None = None
+    git_branch: str | None = None
+    start_time: datetime | None = None
+    end_time: datetime | None = None
+    duration_seconds: int | None = None
+    event_count: int = 0
+    files_modified: list[str] = Field(default_factory=list)
+    files_read: list[str] = Field(default_factory=list)
+    tools_used: list[str] = Field(default_factory=list)
+    phases: list[str] = Field(default_factory=list)
+    decisions: list[str] = Field(default_factory=list)
 
 
 class TimelineEvent(BaseModel):
     """Single event in the timeline."""
 
+    model_config = HOT_MODEL_CONFIG
+
     id: str
     type: str  # "user", "assistant", "tool_use", "tool_result", "thinking"
     timestamp: datetime | None = None
@@ -55,10 +89,21 @@ class TimelineEvent(BaseModel):
     tool_id: str | None = None
     files_affected: list[str] = Field(default_factory=list)
 
+    # Serialized form, filled on first use and reused across timeline pages
+    _json: bytes | None = PrivateAttr(default=None)
+
+    def to_json_bytes(self) -> bytes:
+        """Serialize the event to JSON once and reuse the bytes afterwards."""
+        if self._json is None:
+            self._json = orjson.dumps(self.model_dump(), option=ORJSON_OPTIONS)
+        return self._json
+
 
 class FileChange(BaseModel):
     """File modification info for diff viewer."""
 
+    model_config = HOT_MODEL_CONFIG
+
     file_path: str
     operation: str  # "read", "write", "edit"
     timestamp: datetime | None = None
@@ -67,14 +112,38 @@ class FileChange(BaseModel):
     diff_preview: str | None = None
 
 
+class FileOperation(BaseModel):
+    """Single operation on a file, with a pre-formatted timestamp."""
+
+    type: str  # "read", "write", "edit"
+    timestamp: str | None = None
+
+
+class FileGroup(BaseModel):
+    """All operations on one file path in a session."""
+
+    path: str
+    operations: list[FileOperation] = Field(default_factory=list)
+
+
+class EventMetadata(BaseModel):
+    """Event and session fields denormalized onto a bookmark."""
+
+    event_type: str
+    event_timestamp: datetime | None = None
+    project_name: str
+    git_branch: str | None = None
+
+
 class PaginatedResponse(BaseModel):
     """Paginated API response wrapper."""
 
     data: list
-    total: int
+    total: int | None  # None when the caller skipped the exact count
     offset: int
     limit: int
     has_more: bool
+    next_cursor: str | None = None  # Keyset cursor for the next page, where supported
 
 
 # Rebuild models to resolve forward references
@@ -1,8 +1,52 @@
 """Bookmark service - business logic for bookmarks."""
 
-from sqlite3 import Connection, IntegrityError
-
-from app.models.bookmark import Bookmark, BookmarkCreate, BookmarkUpdate
+import json
+import threading
+from collections import defaultdict
+from collections.abc import Iterable
+from functools import cache
+from sqlite3 import Connection, IntegrityError, Row
+from typing import get_args
+
+from cachetools import LRUCache
+
+from app.models.bookmark import (
+    Bookmark,
+    BookmarkCreate,
+    BookmarkOrderBy,
+    BookmarkUpdate,
+    SortOrder,
+)
+
+# Precomputed ORDER BY fragments for every allowed (column, direction) pair
+ORDER_BY_SQL = {
+    (column, direction): f"{column} {direction.upper()}"
+    for column in get_args(BookmarkOrderBy)
+    for direction in get_args(SortOrder)
+}
+DEFAULT_ORDER_BY_SQL = ORDER_BY_SQL[("created_at", "desc")]
+
+# WHERE fragments for each list_bookmarks filter, in a fixed order
+FILTER_SQL = {
+    "session": "session_id = ?",
+    "project": "project_name = ?",
+    "category": "category = ?",
+    # Trigram FTS5 substring match
+    "search_fts": "id IN (SELECT rowid FROM bookmarks_fts WHERE bookmarks_fts MATCH ?)",
+    # Trigrams can't match fewer than 3 characters
+    "search_like": "note LIKE ?",
+}
+# Filters whose totals can be read from the bookmark_counts table
+COUNTED_FILTERS = frozenset({"session", "project", "category"})
+
+# list_bookmarks results keyed by (_version, arguments). Every write bumps
+# _version, so stale entries are never hit again and age out of the LRU.
+_list_cache: LRUCache = LRUCache(maxsize=512)
+_list_cache_lock = threading.Lock()
+_version = 0
+# Last PRAGMA data_version seen per connection; it changes when another
+# connection (including one in the MCP server process) commits.
+_data_versions: dict[Connection, int] = {}
 
 
 class BookmarkError(Exception):
@@ -24,6 +68,7 @@ def create_bookmark(conn: Connection, data: BookmarkCreate) -> Bookmark:
                 category, note
             )
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            RETURNING *
             """,
             (
                 data.session_id,
@@ -37,26 +82,132 @@ def create_bookmark(conn: Connection, data: BookmarkCreate) -> Bookmark:
                 data.note,
             ),
         )
-        bookmark_id = cursor.lastrowid
-        result = get_bookmark(conn, bookmark_id)
-        if not result:
+        row = cursor.fetchone()
+        if not row:
             raise BookmarkError("Failed to retrieve created bookmark")
-        return result
+        _bump_version()
+        return _row_to_bookmark(row)
     except IntegrityError as e:
         if "UNIQUE constraint failed" in str(e):
             raise DuplicateBookmarkError("Bookmark already exists for this event") from e
         raise
 
 
+def create_bookmarks_bulk(
+    conn: Connection, items: Iterable[BookmarkCreate]
+) -> list[Bookmark]:
+    """Create many bookmarks in one statement batch.
+
+    Bookmarks that already exist for their event are left as they are. Returns
+    the stored bookmark for every requested event, in request order.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    conn.executemany(
+        """
+        INSERT OR IGNORE INTO bookmarks (
+            session_id, event_id, event_index,
+            project_name, git_branch, event_timestamp, event_type,
+            category, note
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            (
+                data.session_id,
+                data.event_id,
+                data.event_index,
+                data.project_name,
+                data.git_branch,
+                data.event_timestamp.isoformat() if data.event_timestamp else None,
+                data.event_type,
+                data.category,
+                data.note,
+            )
+            for data in items
+        ),
+    )
+    _bump_version()
+
+    # Read everything back with one query per session
+    event_ids: defaultdict[str, list[str]] = defaultdict(list)
+    for data in items:
+        event_ids[data.session_id].append(data.event_id)
+
+    stored: dict[tuple[str, str], Bookmark] = {}
+    for session_id, ids in event_ids.items():
+        cursor = conn.execute(
+            """
+            SELECT * FROM bookmarks
+            WHERE session_id = ? AND event_id IN (SELECT value FROM json_each(?))
+            """,
+            (session_id, json.dumps(ids)),
+        )
+        for row in cursor:
+            stored[(row["session_id"], row["event_id"])] = _row_to_bookmark(row)
+
+    return list({
+        (data.session_id, data.event_id): stored[(data.session_id, data.event_id)]
+        for data in items
+    }.values())
+
+
+def _bump_version() -> None:
+    """Invalidate cached list_bookmarks results after a write."""
+    global _version
+    with _list_cache_lock:
+        _version += 1
+
+
+def _current_version(conn: Connection) -> int:
+    """Return the cache version, first accounting for other connections' commits."""
+    global _version
+    data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+    with _list_cache_lock:
+        if _data_versions.get(conn) != data_version:
+            _data_versions[conn] = data_version
+            _version += 1
+        return _version
+
+
+def _row_to_bookmark(row: Row) -> Bookmark:
+    """Build a Bookmark from a bookmarks row."""
+    # Plain validation, which also parses the ISO timestamps in pydantic-core,
+    # is faster than model_construct with Python-side timestamp parsing
+    return Bookmark.model_validate(dict(row))
+
+
 def get_bookmark(conn: Connection, bookmark_id: int) -> Bookmark | None:
     """Get a bookmark by ID."""
     cursor = conn.execute("SELECT * FROM bookmarks WHERE id = ?", (bookmark_id,))
     row = cursor.fetchone()
     if row:
-        return Bookmark(**dict(row))
+        return _row_to_bookmark(row)
     return None
 
 
+@cache
+def _list_bookmarks_sql(filters: tuple[str, ...], order_sql: str) -> tuple[str, str]:
+    """Build the COUNT and page queries for one filter/order combination.
+
+    The set of combinations is small and fixed, and reusing the identical
+    SQL text lets SQLite's per-connection statement cache skip re-preparing.
+    """
+    where_clause = " AND ".join(FILTER_SQL[f] for f in filters) or "1=1"
+    if COUNTED_FILTERS.issuperset(filters):
+        # Filters only on counter-table columns: sum the matching counters
+        count_sql = f"SELECT COALESCE(SUM(n), 0) FROM bookmark_counts WHERE {where_clause}"
+    else:
+        count_sql = f"SELECT COUNT(*) FROM bookmarks WHERE {where_clause}"
+    select_sql = (
+        f"SELECT * FROM bookmarks WHERE {where_clause} "
+        f"ORDER BY {order_sql} LIMIT ? OFFSET ?"
+    )
+    return count_sql, select_sql
+
+
 def list_bookmarks(
     conn: Connection,
     session_id: str | None = None,
@@ -65,59 +216,73 @@ def list_bookmarks(
     search: str | None = None,
     offset: int = 0,
     limit: int = 50,
-    order_by: str = "created_at",
-    order: str = "desc",
+    order_by: BookmarkOrderBy = "created_at",
+    order: SortOrder = "desc",
+    exact_total: bool = True,
 ) -> tuple[list[Bookmark], int]:
-    """List bookmarks with optional filtering."""
-    # Build WHERE clause
-    where_clauses = []
+    """List bookmarks with optional filtering.
+
+    With exact_total=False the COUNT query is skipped; one lookahead row is
+    fetched instead and the returned total is only a lower bound.
+    Results are cached until the next bookmark write.
+    """
+    # Read the version before querying so a concurrent write can't leave
+    # pre-write results cached under the post-write version
+    cache_key = (
+        _current_version(conn),
+        session_id, project, category, search,
+        offset, limit, order_by, order, exact_total,
+    )
+    with _list_cache_lock:
+        cached = _list_cache.get(cache_key)
+    if cached is not None:
+        bookmarks, total = cached
+        return list(bookmarks), total
+
+    filters = []
     params = []
 
     if session_id:
-        where_clauses.append("session_id = ?")
+        filters.append("session")
         params.append(session_id)
 
     if project:
-        where_clauses.append("project_name = ?")
+        filters.append("project")
         params.append(project)
 
     if category:
-        where_clauses.append("category = ?")
+        filters.append("category")
         params.append(category)
 
     if search:
-        where_clauses.append("note LIKE ?")
-        params.append(f"%{search}%")
-
-    where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
-
-    # Validate order_by and order
-    allowed_order_by = ["created_at", "updated_at", "event_timestamp", "id"]
-    allowed_order = ["asc", "desc"]
-    if order_by not in allowed_order_by:
-        order_by = "created_at"
-    if order not in allowed_order:
-        order = "desc"
+        if len(search) >= 3:
+            # Quote to treat input as a literal phrase
+            filters.append("search_fts")
+            params.append('"' + search.replace('"', '""') + '"')
+        else:
+            filters.append("search_like")
+            params.append(f"%{search}%")
+
+    # Only whitelisted fragments ever reach the SQL string
+    order_sql = ORDER_BY_SQL.get((order_by, order), DEFAULT_ORDER_BY_SQL)
+    count_sql, select_sql = _list_bookmarks_sql(tuple(filters), order_sql)
 
     # Get total count
-    cursor = conn.execute(
-        f"SELECT COUNT(*) FROM bookmarks WHERE {where_clause}",
-        params,
-    )
-    total = cursor.fetchone()[0]
+    if exact_total:
+        total = conn.execute(count_sql, params).fetchone()[0]
 
-    # Get paginated results
+    # Get paginated results (plus one lookahead row when not counting)
     cursor = conn.execute(
-        f"""
-        SELECT * FROM bookmarks
-        WHERE {where_clause}
-        ORDER BY {order_by} {order}
-        LIMIT ? OFFSET ?
-        """,
-        params + [limit, offset],
+        select_sql, params + [limit if exact_total else limit + 1, offset]
     )
-    bookmarks = [Bookmark(**dict(row)) for row in cursor.fetchall()]
-
+    rows = cursor.fetchall()
+    if not exact_total:
+        total = offset + len(rows)
+        rows = rows[:limit]
+    bookmarks = [_row_to_bookmark(row) for row in rows]
+
+    with _list_cache_lock:
+        _list_cache[cache_key] = (tuple(bookmarks), total)
     return bookmarks, total
 
 
@@ -142,23 +307,28 @@ def update_bookmark(
     updates.append("updated_at = CURRENT_TIMESTAMP")
     params.append(bookmark_id)
 
-    conn.execute(
-        f"UPDATE bookmarks SET {', '.join(updates)} WHERE id = ?",
+    cursor = conn.execute(
+        f"UPDATE bookmarks SET {', '.join(updates)} WHERE id = ? RETURNING *",
         params,
     )
-
-    return get_bookmark(conn, bookmark_id)
+    row = cursor.fetchone()
+    if not row:
+        return None
+    _bump_version()
+    return _row_to_bookmark(row)
 
 
 def delete_bookmark(conn: Connection, bookmark_id: int) -> bool:
     """Delete a bookmark. Returns True if deleted, False if not found."""
     cursor = conn.execute("DELETE FROM bookmarks WHERE id = ?", (bookmark_id,))
+    _bump_version()
     return cursor.rowcount > 0
 
 
 def delete_session_bookmarks(conn: Connection, session_id: str) -> int:
     """Delete all bookmarks for a session. Returns number deleted."""
     cursor = conn.execute("DELETE FROM bookmarks WHERE session_id = ?", (session_id,))
+    _bump_version()
     return cursor.rowcount
 
 
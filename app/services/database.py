@@ -1,10 +1,37 @@
 """Database connection management and initialization."""
 
+import queue
 import sqlite3
+import threading
 from contextlib import contextmanager
 
 from app.config import settings
 
+# Applied to every connection when it is first opened
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 MB
+    "PRAGMA mmap_size=268435456",  # 256 MB
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA wal_autocheckpoint=1000",  # pages
+    "PRAGMA foreign_keys=ON",
+)
+
+# Single long-lived writer connection; the lock serializes write transactions
+# so they never contend for SQLite's write lock.
+_writer_conn: sqlite3.Connection | None = None
+_writer_lock = threading.Lock()
+
+# Read-only connections, opened lazily up to READER_POOL_SIZE and handed out
+# one per request. WAL lets them read concurrently with the writer; LIFO keeps
+# the most recently used (warmest) one in play.
+READER_POOL_SIZE = 4
+_reader_pool: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+_reader_pool_lock = threading.Lock()
+_readers_opened = 0
+
 
 def init_database():
     """Initialize database and create tables."""
@@ -12,9 +39,9 @@ def init_database():
     settings.bookmark_db_path.parent.mkdir(parents=True, exist_ok=True)
 
     with sqlite3.connect(settings.bookmark_db_path) as conn:
-        # Enable WAL mode for better concurrency
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA busy_timeout=5000")
+        # WAL mode for concurrency, plus the same tuning as pooled connections
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
 
         # Create bookmarks table
         conn.execute("""
@@ -43,11 +70,21 @@ def init_database():
         """)
 
         # Create indexes for fast queries
+        # Composite indexes serve both the filter and the default created_at
+        # ordering; they supersede the old single-column indexes
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_bookmarks_session_created
+            ON bookmarks(session_id, created_at DESC)
+        """)
+
         conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_bookmarks_session_id
-            ON bookmarks(session_id)
+            CREATE INDEX IF NOT EXISTS idx_bookmarks_project_created
+            ON bookmarks(project_name, created_at DESC)
         """)
 
+        conn.execute("DROP INDEX IF EXISTS idx_bookmarks_session_id")
+        conn.execute("DROP INDEX IF EXISTS idx_bookmarks_project_name")
+
         conn.execute("""
             CREATE INDEX IF NOT EXISTS idx_bookmarks_category
             ON bookmarks(category)
@@ -63,33 +100,203 @@ def init_database():
             ON bookmarks(event_timestamp DESC)
         """)
 
+        # FTS5 index over bookmark notes. The trigram tokenizer keeps the
+        # substring semantics of the previous LIKE search.
+        fts_exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'bookmarks_fts'"
+        ).fetchone()
+
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS bookmarks_fts USING fts5(
+                note,
+                content='bookmarks',
+                content_rowid='id',
+                tokenize='trigram'
+            )
+        """)
+
+        # Triggers to keep FTS5 in sync with bookmarks table
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS bookmarks_ai AFTER INSERT ON bookmarks BEGIN
+                INSERT INTO bookmarks_fts(rowid, note) VALUES (new.id, new.note);
+            END
+        """)
+
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS bookmarks_ad AFTER DELETE ON bookmarks BEGIN
+                INSERT INTO bookmarks_fts(bookmarks_fts, rowid, note)
+                VALUES ('delete', old.id, old.note);
+            END
+        """)
+
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS bookmarks_au AFTER UPDATE OF note ON bookmarks BEGIN
+                INSERT INTO bookmarks_fts(bookmarks_fts, rowid, note)
+                VALUES ('delete', old.id, old.note);
+                INSERT INTO bookmarks_fts(rowid, note) VALUES (new.id, new.note);
+            END
+        """)
+
+        # Index bookmarks created before the FTS table existed
+        if not fts_exists:
+            conn.execute("INSERT INTO bookmarks_fts(bookmarks_fts) VALUES('rebuild')")
+
+        # Bookmark counts per (session, project, category) so list totals
+        # don't have to scan bookmarks. NULLs are stored as '' because NULL
+        # primary-key values never conflict, which would break the upserts.
+        counts_exist = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'bookmark_counts'"
+        ).fetchone()
+
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS bookmark_counts (
+                session_id TEXT NOT NULL,
+                project_name TEXT NOT NULL,
+                category TEXT NOT NULL,
+                n INTEGER NOT NULL,
+                PRIMARY KEY (session_id, project_name, category)
+            ) WITHOUT ROWID
+        """)
+
+        # Triggers to keep bookmark_counts in sync with bookmarks table
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS bookmark_counts_ai AFTER INSERT ON bookmarks BEGIN
+                INSERT INTO bookmark_counts (session_id, project_name, category, n)
+                VALUES (new.session_id, COALESCE(new.project_name, ''), COALESCE(new.category, ''), 1)
+                ON CONFLICT DO UPDATE SET n = n + 1;
+            END
+        """)
+
+        # Recreated on every start: earlier versions dropped empty counts with
+        # an unkeyed DELETE that scanned the whole table on each write
+        conn.execute("DROP TRIGGER IF EXISTS bookmark_counts_ad")
+        conn.execute("DROP TRIGGER IF EXISTS bookmark_counts_au")
+
+        conn.execute("""
+            CREATE TRIGGER bookmark_counts_ad AFTER DELETE ON bookmarks BEGIN
+                UPDATE bookmark_counts SET n = n - 1
+                WHERE session_id = old.session_id
+                    AND project_name = COALESCE(old.project_name, '')
+                    AND category = COALESCE(old.category, '');
+                DELETE FROM bookmark_counts
+                WHERE session_id = old.session_id
+                    AND project_name = COALESCE(old.project_name, '')
+                    AND category = COALESCE(old.category, '')
+                    AND n <= 0;
+            END
+        """)
+
         conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_bookmarks_project_name
-            ON bookmarks(project_name)
+            CREATE TRIGGER bookmark_counts_au
+            AFTER UPDATE OF session_id, project_name, category ON bookmarks BEGIN
+                UPDATE bookmark_counts SET n = n - 1
+                WHERE session_id = old.session_id
+                    AND project_name = COALESCE(old.project_name, '')
+                    AND category = COALESCE(old.category, '');
+                INSERT INTO bookmark_counts (session_id, project_name, category, n)
+                VALUES (new.session_id, COALESCE(new.project_name, ''), COALESCE(new.category, ''), 1)
+                ON CONFLICT DO UPDATE SET n = n + 1;
+                DELETE FROM bookmark_counts
+                WHERE session_id = old.session_id
+                    AND project_name = COALESCE(old.project_name, '')
+                    AND category = COALESCE(old.category, '')
+                    AND n <= 0;
+            END
         """)
 
+        # Count bookmarks created before the counts table existed
+        if not counts_exist:
+            conn.execute("""
+                INSERT INTO bookmark_counts (session_id, project_name, category, n)
+                SELECT session_id, COALESCE(project_name, ''), COALESCE(category, ''), COUNT(*)
+                FROM bookmarks
+                GROUP BY 1, 2, 3
+            """)
+
+        # Refresh planner statistics so the composite indexes get picked
+        conn.execute("ANALYZE")
+
         conn.commit()
 
 
-@contextmanager
-def get_db_connection():
-    """Get database connection with automatic commit/rollback."""
+def _connect() -> sqlite3.Connection:
+    """Open a database connection with performance pragmas applied."""
     # check_same_thread=False is needed for FastAPI's async/threaded request handling
+    # A larger statement cache keeps every list_bookmarks query shape prepared
     conn = sqlite3.connect(
-        settings.bookmark_db_path, timeout=5.0, check_same_thread=False
+        settings.bookmark_db_path,
+        timeout=5.0,
+        check_same_thread=False,
+        cached_statements=256,
     )
     conn.row_factory = sqlite3.Row  # Dict-like access
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def _acquire_reader() -> sqlite3.Connection:
+    """Take a reader connection, opening a new one if the pool isn't full yet."""
+    global _readers_opened
+
     try:
-        yield conn
-        conn.commit()
+        return _reader_pool.get_nowait()
+    except queue.Empty:
+        pass
+
+    with _reader_pool_lock:
+        can_open = _readers_opened < READER_POOL_SIZE
+        if can_open:
+            _readers_opened += 1
+
+    if not can_open:
+        # Every reader is in use; wait for one to be returned
+        return _reader_pool.get()
+
+    try:
+        conn = _connect()
+        conn.execute("PRAGMA query_only=ON")
+        return conn
     except Exception:
-        conn.rollback()
+        with _reader_pool_lock:
+            _readers_opened -= 1
         raise
+
+
+@contextmanager
+def get_db_connection():
+    """Get the writer connection with automatic commit/rollback.
+
+    Use this for anything that modifies bookmarks; write transactions are
+    serialized on the single writer. Keep the block to the write itself, since
+    the writer lock is held until it exits (there is deliberately no FastAPI
+    dependency, which would hold it for the whole request).
+    """
+    global _writer_conn
+
+    with _writer_lock:
+        if _writer_conn is None:
+            _writer_conn = _connect()
+        conn = _writer_conn
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+
+@contextmanager
+def get_read_connection():
+    """Get a pooled read-only connection; runs concurrently with the writer."""
+    conn = _acquire_reader()
+    try:
+        yield conn
     finally:
-        conn.close()
+        _reader_pool.put(conn)
 
 
-def get_db():
-    """FastAPI dependency for database connection."""
-    with get_db_connection() as conn:
+def get_read_db():
+    """FastAPI dependency for a read-only database connection."""
+    with get_read_connection() as conn:
         yield conn
@@ -1,7 +1,30 @@
 """Export service - generates various output formats."""
 
+import gzip
+import logging
+import os
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from functools import lru_cache
+from pathlib import Path
+
+from cachetools import LRUCache
+
+from app.config import settings
 from app.models.session import SessionDetail
 
+logger = logging.getLogger(__name__)
+
+# Compressed exports of large sessions, keyed by session file mtime
+EXPORT_CACHE_DIR = settings.upload_dir / "exports"
+EXPORT_COMPRESSLEVEL = 6
+
+# Rendered markdown keyed by (session id, file path, mtime_ns, flags), bounded
+# by total characters rather than entry count since sessions vary in size
+MARKDOWN_CACHE_MAX_CHARS = 64 * 1024 * 1024
+_markdown_cache: LRUCache = LRUCache(maxsize=MARKDOWN_CACHE_MAX_CHARS, getsizeof=len)
+_markdown_cache_lock = threading.Lock()
+
 
 def truncate_text(text: str, max_length: int = 500) -> str:
     """Truncate text with ellipsis if too long."""
@@ -17,77 +40,108 @@ def format_time(dt) -> str:
     return dt.strftime("%H:%M:%S")
 
 
+@lru_cache(maxsize=2048)
 def format_date(dt) -> str:
-    """Format datetime as date."""
+    """Format datetime as date (memoized; session lists repeat the same dates)."""
     if not dt:
         return ""
     return dt.strftime("%Y-%m-%d")
 
 
+def _format_bash(tool_input: dict, lines: list[str]) -> None:
+    """Command in a bash block, with its description if any."""
+    cmd = tool_input.get("command", "")
+    desc = tool_input.get("description", "")
+    if desc:
+        lines.append(f"_{desc}_")
+    lines.append(f"```bash\n{truncate_text(cmd, 300)}\n```")
+
+
+def _format_read(tool_input: dict, lines: list[str]) -> None:
+    """Path being read."""
+    lines.append(f"Reading: `{tool_input.get('file_path', '')}`")
+
+
+def _format_write(tool_input: dict, lines: list[str]) -> None:
+    """Path being written, with a content preview."""
+    content = tool_input.get("content", "")
+    lines.append(f"Writing: `{tool_input.get('file_path', '')}`")
+    if content:
+        lines.append(f"```\n{truncate_text(content, 200)}\n```")
+
+
+def _format_edit(tool_input: dict, lines: list[str]) -> None:
+    """Path being edited, with a truncated before/after diff."""
+    get = tool_input.get
+    old = truncate_text(get("old_string", ""), 100)
+    new = truncate_text(get("new_string", ""), 100)
+    lines.append(f"Editing: `{get('file_path', '')}`")
+    lines.append(f"```diff\n- {old}\n+ {new}\n```")
+
+
+def _format_search(tool_input: dict, lines: list[str]) -> None:
+    """Glob/Grep pattern and search root."""
+    pattern = tool_input.get("pattern", "")
+    path = tool_input.get("path", ".")
+    lines.append(f"Searching for: `{pattern}` in `{path}`")
+
+
+TODO_STATUS_ICONS = {"pending": "[ ]", "in_progress": "[~]", "completed": "[x]"}
+
+
+def _format_todo_write(tool_input: dict, lines: list[str]) -> None:
+    """Todo items with status checkboxes."""
+    lines.append("Todo List Update:")
+    for todo in tool_input.get("todos", [])[:10]:
+        icon = TODO_STATUS_ICONS.get(todo.get("status", "pending"), "[ ]")
+        lines.append(f"  {icon} {todo.get('content', '')}")
+
+
+def _format_task(tool_input: dict, lines: list[str]) -> None:
+    """Subagent type and task description."""
+    desc = tool_input.get("description", "")
+    lines.append(f"Spawning agent: {tool_input.get('subagent_type', '')}")
+    if desc:
+        lines.append(f"Task: {desc}")
+
+
+def _format_generic(tool_input: dict, lines: list[str]) -> None:
+    """First few string inputs of any other tool."""
+    for key, value in list(tool_input.items())[:5]:
+        if isinstance(value, str):
+            lines.append(f"  {key}: {truncate_text(value, 100)}")
+
+
+# Per-tool body formatters; anything else lists its string inputs
+TOOL_FORMATTERS: dict[str, Callable[[dict, list[str]], None]] = {
+    "Bash": _format_bash,
+    "Read": _format_read,
+    "Write": _format_write,
+    "Edit": _format_edit,
+    "Glob": _format_search,
+    "Grep": _format_search,
+    "TodoWrite": _format_todo_write,
+    "Task": _format_task,
+}
+
+
 def format_tool_use(tool_name: str, tool_input: dict) -> str:
     """Format tool use for markdown output."""
     lines = [f"**Tool: {tool_name}**"]
-
-    if tool_name == "Bash":
-        cmd = tool_input.get("command", "")
-        desc = tool_input.get("description", "")
-        if desc:
-            lines.append(f"_{desc}_")
-        lines.append("```bash")
-        lines.append(truncate_text(cmd, 300))
-        lines.append("```")
-    elif tool_name == "Read":
-        path = tool_input.get("file_path", "")
-        lines.append(f"Reading: `{path}`")
-    elif tool_name == "Write":
-        path = tool_input.get("file_path", "")
-        content = tool_input.get("content", "")
-        lines.append(f"Writing: `{path}`")
-        if content:
-            preview = truncate_text(content, 200)
-            lines.append(f"```\n{preview}\n```")
-    elif tool_name == "Edit":
-        path = tool_input.get("file_path", "")
-        old = truncate_text(tool_input.get("old_string", ""), 100)
-        new = truncate_text(tool_input.get("new_string", ""), 100)
-        lines.append(f"Editing: `{path}`")
-        lines.append(f"```diff\n- {old}\n+ {new}\n```")
-    elif tool_name == "Glob":
-        pattern = tool_input.get("pattern", "")
-        path = tool_input.get("path", ".")
-        lines.append(f"Searching for: `{pattern}` in `{path}`")
-    elif tool_name == "Grep":
-        pattern = tool_input.get("pattern", "")
-        path = tool_input.get("path", ".")
-        lines.append(f"Searching for: `{pattern}` in `{path}`")
-    elif tool_name == "TodoWrite":
-        todos = tool_input.get("todos", [])
-        lines.append("Todo List Update:")
-        for todo in todos[:10]:
-            status = todo.get("status", "pending")
-            content = todo.get("content", "")
-            icon = {"pending": "[ ]", "in_progress": "[~]", "completed": "[x]"}.get(status, "[ ]")
-            lines.append(f"  {icon} {content}")
-    elif tool_name == "Task":
-        desc = tool_input.get("description", "")
-        agent = tool_input.get("subagent_type", "")
-        lines.append(f"Spawning agent: {agent}")
-        if desc:
-            lines.append(f"Task: {desc}")
-    else:
-        for key, value in list(tool_input.items())[:5]:
-            if isinstance(value, str):
-                lines.append(f"  {key}: {truncate_text(str(value), 100)}")
-
+    TOOL_FORMATTERS.get(tool_name, _format_generic)(tool_input, lines)
     return "\n".join(lines)
 
 
-def generate_markdown(
+def iter_markdown(
     session: SessionDetail,
     include_thinking: bool = False,
     verbose: bool = False
-) -> str:
-    """Generate markdown output from session data."""
+) -> Iterator[str]:
+    """Generate markdown output from session data in chunks.
+
+    Yields the header/summary block first, then one chunk per rendered event,
+    so large sessions can be streamed without building the whole document.
+    """
     lines = []
 
     # Header
@@ -143,48 +197,148 @@ def generate_markdown(
     lines.append("## Conversation")
     lines.append("")
 
-    # Messages
+    yield "\n".join(lines)
+
+    # Messages: one string per event, built in a single formatting step
+    # instead of appending to and joining a per-event list
     for event in session.events:
         time_str = format_time(event.timestamp) if event.timestamp else ""
+        event_type = event.type
 
-        if event.type == "user":
-            lines.append(f"### User [{time_str}]")
-            lines.append("")
+        if event_type == "user":
             content = event.content or ""
             if len(content) > 1000:
-                lines.append("<details>")
-                lines.append("<summary>Long message (click to expand)</summary>")
-                lines.append("")
-                lines.append(content)
-                lines.append("")
-                lines.append("</details>")
-            else:
-                lines.append(content)
-            lines.append("")
-
-        elif event.type == "assistant":
-            lines.append(f"### Assistant [{time_str}]")
-            lines.append("")
-            lines.append(event.content or "")
-            lines.append("")
-
-        elif event.type == "thinking" and include_thinking:
-            lines.append("<details>")
-            lines.append(f"<summary>Thinking [{time_str}]</summary>")
-            lines.append("")
-            lines.append(truncate_text(event.content or "", 2000))
-            lines.append("")
-            lines.append("</details>")
-            lines.append("")
-
-        elif event.type == "tool_use":
-            lines.append("<details>")
-            lines.append(f"<summary>Tool: {event.tool_name} [{time_str}]</summary>")
-            lines.append("")
-            if event.tool_input:
-                lines.append(format_tool_use(event.tool_name or "", event.tool_input))
-            lines.append("")
-            lines.append("</details>")
-            lines.append("")
+                content = (
+                    "<details>\n"
+                    "<summary>Long message (click to expand)</summary>\n"
+                    f"\n{content}\n\n</details>"
+                )
+            yield f"\n### User [{time_str}]\n\n{content}\n"
 
-    return "\n".join(lines)
+        elif event_type == "assistant":
+            yield f"\n### Assistant [{time_str}]\n\n{event.content or ''}\n"
+
+        elif event_type == "thinking" and include_thinking:
+            yield (
+                f"\n<details>\n<summary>Thinking [{time_str}]</summary>\n\n"
+                f"{truncate_text(event.content or '', 2000)}\n\n</details>\n"
+            )
+
+        elif event_type == "tool_use":
+            tool = (
+                format_tool_use(event.tool_name or "", event.tool_input) + "\n"
+                if event.tool_input
+                else ""
+            )
+            yield (
+                f"\n<details>\n<summary>Tool: {event.tool_name} [{time_str}]</summary>\n\n"
+                f"{tool}\n</details>\n"
+            )
+
+
+def generate_markdown(
+    session: SessionDetail,
+    include_thinking: bool = False,
+    verbose: bool = False
+) -> str:
+    """Generate markdown output from session data.
+
+    Results are memoized per session file version, so repeat exports of an
+    unchanged session skip rendering.
+    """
+    try:
+        mtime_ns = Path(session.file_path).stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
+
+    key = (session.session_id, session.file_path, mtime_ns, include_thinking, verbose)
+    if mtime_ns is not None:
+        with _markdown_cache_lock:
+            markdown = _markdown_cache.get(key)
+        if markdown is not None:
+            return markdown
+
+    markdown = "".join(iter_markdown(session, include_thinking=include_thinking, verbose=verbose))
+
+    # Documents larger than the whole cache are simply not stored
+    if mtime_ns is not None and len(markdown) <= MARKDOWN_CACHE_MAX_CHARS:
+        with _markdown_cache_lock:
+            _markdown_cache[key] = markdown
+    return markdown
+
+
+def get_cached_export(
+    session_id: str,
+    file_path: str,
+    variant: str,
+    render: Callable[[], Iterable[str | bytes]],
+) -> Path | None:
+    """Get a gzip-compressed export from the on-disk cache, writing it on a miss.
+
+    Files are named ``{session_id}.{variant}.{mtime_ns}.gz`` so a modified
+    session file never matches a stale export; older versions of the same
+    export are pruned whenever a new one is written, and the whole cache is
+    kept under settings.export_cache_max_bytes.
+
+    Args:
+        session_id: ID of the session being exported
+        file_path: The session's JSONL file
+        variant: Export flags as digits plus format, e.g. "10.md" for markdown
+            with include_thinking=1, verbose=0, or "1.json"
+        render: Produces the export's chunks; only called on a cache miss
+
+    Returns:
+        Path to the compressed export, or None if it could not be cached
+    """
+    try:
+        mtime_ns = Path(file_path).stat().st_mtime_ns
+    except OSError:
+        return None
+
+    prefix = f"{Path(session_id).name}.{variant}."
+    path = EXPORT_CACHE_DIR / f"{prefix}{mtime_ns}.gz"
+    try:
+        # Bump the mtime so eviction treats it as recently used
+        os.utime(path)
+        return path
+    except OSError:
+        pass
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        EXPORT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with gzip.open(tmp_path, "wb", compresslevel=EXPORT_COMPRESSLEVEL) as f:
+            for chunk in render():
+                f.write(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Failed to cache export {path.name}: {e}")
+        tmp_path.unlink(missing_ok=True)
+        return None
+
+    # Prune exports written for earlier versions of the session file
+    for old_path in EXPORT_CACHE_DIR.glob(f"{prefix}*.gz"):
+        if old_path != path:
+            old_path.unlink(missing_ok=True)
+
+    _evict_exports(keep=path)
+    return path
+
+
+def _evict_exports(keep: Path) -> None:
+    """Delete least recently used exports until the cache fits its size cap."""
+    entries = []
+    for cached_path in EXPORT_CACHE_DIR.glob("*.gz"):
+        try:
+            stat = cached_path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, cached_path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, cached_path in sorted(entries, key=lambda entry: entry[0]):
+        if total <= settings.export_cache_max_bytes:
+            break
+        if cached_path != keep:
+            cached_path.unlink(missing_ok=True)
+            total -= size
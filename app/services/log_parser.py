@@ -1,11 +1,69 @@
 """Log parsing service - refactored from CLI tool."""
 
-import json
+import multiprocessing
+import os
 import re
+import string
+import threading
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+from itertools import chain
 from pathlib import Path
 
-from app.models.session import FileChange, SessionDetail, SessionSummary, TimelineEvent
+import orjson
+from cachetools import LRUCache
+
+from app.models.session import (
+    FileChange,
+    FileGroup,
+    FileOperation,
+    SessionDetail,
+    SessionSummary,
+    TimelineEvent,
+)
+
+# Read buffer for session logs, which are often several MB
+JSONL_READ_BUFFER_SIZE = 64 * 1024
+
+# Unique phases/decisions kept per session
+MAX_PHASES = 15
+MAX_DECISIONS = 15
+
+# Memoized summaries (small, frozen models), keyed by file version
+SUMMARY_CACHE_SIZE = 1024
+_summary_cache: LRUCache = LRUCache(maxsize=SUMMARY_CACHE_SIZE)
+_summary_cache_lock = threading.Lock()
+
+# Below this many files, handing work to worker processes costs more than it saves
+PARALLEL_SUMMARY_MIN_FILES = 32
+
+# Parser worker processes, started on first use and kept for the process
+# lifetime so each large batch doesn't pay for spawning and re-importing
+PARSE_WORKERS = os.cpu_count() or 1
+_parse_pool: ProcessPoolExecutor | None = None
+_parse_pool_lock = threading.Lock()
+
+# Compiled once at import; these run against every message in a session
+# Runs of path characters in shell commands (see find_bash_paths)
+BASH_TOKEN_RE = re.compile(r"[/\w.-]+")
+ASCII_LETTERS = frozenset(string.ascii_letters)
+NUMBERED_ITEM_RE = re.compile(r"^\s*(\d+[\.\)]\s*.+)$", re.MULTILINE)
+CHECKBOX_ITEM_RE = re.compile(r"^\s*[-*]\s*\[[ x]\]\s*(.+)$", re.MULTILINE)
+DECISION_RES = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"(?:I'll|Let's|We should|Going to|I will|We'll)\s+([^.!?\n]+[.!?]?)",
+        r"(?:decided to|choosing to|opting for)\s+([^.!?\n]+[.!?]?)",
+    )
+]
+# Lowercase forms of the decision phrases, for a cheap substring prescreen
+DECISION_KEYWORDS = (
+    "i'll", "let's", "we should", "going to", "i will", "we'll",
+    "decided to", "choosing to", "opting for",
+)
 
 
 def parse_timestamp(ts: str) -> datetime | None:
@@ -13,7 +71,7 @@ def parse_timestamp(ts: str) -> datetime | None:
     if not ts:
         return None
     try:
-        ts = ts.replace("Z", "+00:00")
+        # fromisoformat parses a trailing "Z" natively on Python 3.11+
         return datetime.fromisoformat(ts)
     except (ValueError, TypeError):
         return None
@@ -26,54 +84,103 @@ def truncate_text(text: str, max_length: int = 500) -> str:
     return text[:max_length] + "... [truncated]"
 
 
-def extract_files_from_tool_use(name: str, input_data: dict) -> list[str]:
-    """Extract file paths from tool use inputs."""
-    files = []
+def find_bash_paths(cmd: str) -> list[str]:
+    r"""Find path-like words with a short extension in a shell command.
+
+    Same result as re.findall(r"[/\w.-]+\.[a-zA-Z]{1,10}", cmd), but
+    linear: that regex backtracks quadratically on long runs without a
+    matching extension, such as base64 blobs in heredocs.
+    """
+    paths = []
+    for token in BASH_TOKEN_RE.findall(cmd):
+        # The regex match is greedy: it runs to the last "." (not the first
+        # character) that is followed by an ASCII letter, plus up to 10
+        # letters. Nothing after that within the token can match again.
+        dot = token.rfind(".", 1)
+        while dot != -1 and (dot + 1 == len(token) or token[dot + 1] not in ASCII_LETTERS):
+            dot = token.rfind(".", 1, dot)
+        if dot == -1:
+            continue
+        end = dot + 1
+        while end < len(token) and end - dot <= 10 and token[end] in ASCII_LETTERS:
+            end += 1
+        paths.append(token[:end])
+    return paths
+
+
+def _files_from_path_tool(input_data: dict) -> list[str]:
+    """Read/Write/Edit: the file_path argument."""
+    if "file_path" in input_data:
+        return [input_data["file_path"]]
+    return []
+
+
+def _files_from_bash(input_data: dict) -> list[str]:
+    """Bash: path-like words in the command."""
+    return find_bash_paths(input_data.get("command", ""))
+
+
+def _files_from_glob(input_data: dict) -> list[str]:
+    """Glob: the pattern, as a bracketed pseudo-path."""
+    if "pattern" in input_data:
+        return [f"[pattern: {input_data['pattern']}]"]
+    return []
+
+
+def _files_from_grep(input_data: dict) -> list[str]:
+    """Grep: the search pattern, as a bracketed pseudo-path."""
+    if "pattern" in input_data:
+        return [f"[search: {input_data['pattern']}]"]
+    return []
+
 
-    if name in ("Read", "Write", "Edit"):
-        if "file_path" in input_data:
-            files.append(input_data["file_path"])
-    elif name == "Bash":
-        cmd = input_data.get("command", "")
-        path_patterns = re.findall(r"[/\w.-]+\.[a-zA-Z]{1,10}", cmd)
-        files.extend(path_patterns)
-    elif name == "Glob":
-        if "pattern" in input_data:
-            files.append(f"[pattern: {input_data['pattern']}]")
-    elif name == "Grep":
-        if "pattern" in input_data:
-            files.append(f"[search: {input_data['pattern']}]")
+# Per-tool file extractors; other tools affect no files
+TOOL_FILE_EXTRACTORS: dict[str, Callable[[dict], list[str]]] = {
+    "Read": _files_from_path_tool,
+    "Write": _files_from_path_tool,
+    "Edit": _files_from_path_tool,
+    "Bash": _files_from_bash,
+    "Glob": _files_from_glob,
+    "Grep": _files_from_grep,
+}
 
-    return files
+
+def extract_files_from_tool_use(name: str, input_data: dict) -> list[str]:
+    """Extract file paths from tool use inputs."""
+    extractor = TOOL_FILE_EXTRACTORS.get(name)
+    return extractor(input_data) if extractor else []
 
 
 def detect_phases_and_plans(text: str) -> list[str]:
     """Detect phase lists, todo items, and plans in text."""
     phases = []
 
-    numbered_pattern = re.compile(r"^\s*(\d+[\.\)]\s*.+)$", re.MULTILINE)
-    matches = numbered_pattern.findall(text)
+    matches = NUMBERED_ITEM_RE.findall(text)
     if len(matches) >= 2:
         phases.extend(matches[:10])
 
-    checkbox_pattern = re.compile(r"^\s*[-*]\s*\[[ x]\]\s*(.+)$", re.MULTILINE)
-    matches = checkbox_pattern.findall(text)
-    phases.extend(matches[:10])
+    # Checkbox items need a literal "["; a substring test is far cheaper than a scan
+    if "[" in text:
+        matches = CHECKBOX_ITEM_RE.findall(text)
+        phases.extend(matches[:10])
 
     return phases
 
 
 def detect_decisions(text: str) -> list[str]:
     """Detect key decisions mentioned in text."""
-    decisions = []
+    # Most texts contain none of the phrases; substring tests rule that out far
+    # faster than the regex scans. Only for ASCII text, where lower() agrees
+    # with IGNORECASE matching (it doesn't for e.g. "ı", "İ" or "ſ").
+    if text.isascii():
+        lowered = text.lower()
+        if not any(keyword in lowered for keyword in DECISION_KEYWORDS):
+            return []
 
-    decision_patterns = [
-        r"(?:I'll|Let's|We should|Going to|I will|We'll)\s+([^.!?\n]+[.!?]?)",
-        r"(?:decided to|choosing to|opting for)\s+([^.!?\n]+[.!?]?)",
-    ]
+    decisions = []
 
-    for pattern in decision_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
+    for pattern in DECISION_RES:
+        matches = pattern.findall(text)
         for match in matches[:5]:
             if len(match) > 20:
                 decisions.append(match.strip())
@@ -81,26 +188,41 @@ def detect_decisions(text: str) -> list[str]:
     return decisions[:10]
 
 
-def parse_jsonl_file(filepath: Path) -> list[dict]:
-    """Parse a JSONL file into a list of entries."""
-    entries = []
-    with open(filepath, encoding="utf-8") as f:
+def iter_jsonl_file(filepath: Path) -> Iterator[dict]:
+    """Yield the entries of a JSONL file one at a time, skipping bad lines."""
+    # Read raw bytes: orjson decodes UTF-8 itself, skipping a text-decoding pass.
+    # orjson accepts surrounding whitespace, and blank lines fail to decode and
+    # are skipped below, so lines are passed through without stripping.
+    with open(filepath, "rb", buffering=JSONL_READ_BUFFER_SIZE) as f:
         for line in f:
-            line = line.strip()
-            if not line:
-                continue
             try:
-                entry = json.loads(line)
-                entries.append(entry)
-            except json.JSONDecodeError:
+                yield orjson.loads(line)
+            except orjson.JSONDecodeError:
                 continue
-    return entries
+
+
+def parse_jsonl_file(filepath: Path) -> list[dict]:
+    """Parse a JSONL file into a list of entries."""
+    return list(iter_jsonl_file(filepath))
+
+
+def _collect_unique(found: dict[str, None], items: list[str], limit: int) -> None:
+    """Add new items to an ordered dedup dict until it holds limit entries."""
+    for item in items:
+        if len(found) >= limit:
+            return
+        found[item] = None
 
 
 def process_entries(
-    entries: list[dict], include_thinking: bool = False
+    entries: Iterable[dict], include_thinking: bool = False, summary_only: bool = False
 ) -> dict:
-    """Process entries and extract structured data."""
+    """Process entries and extract structured data.
+
+    With summary_only=True, only the metadata, counts, tools and file sets
+    that SessionSummary needs are collected: no events are built and the
+    phase/decision scans are skipped.
+    """
     result = {
         "session_id": None,
         "cwd": None,
@@ -113,26 +235,43 @@ def process_entries(
         "phases": [],
         "decisions": [],
         "events": [],
+        "message_count": 0,
+        "tool_count": 0,
     }
 
     event_counter = 0
+    message_count = tool_count = 0
+
+    # Loop state lives in locals and is written back to result afterwards;
+    # dict lookups per entry add up on sessions with thousands of entries
+    session_id = cwd = git_branch = None
+    start_time = end_time = None
+    append_event = result["events"].append
+    files_modified = result["files_modified"]
+    files_read = result["files_read"]
+    tools_used = result["tools_used"]
+    # Insertion-ordered dicts double as dedup sets; once full, scans stop
+    phases_found: dict[str, None] = {}
+    decisions_found: dict[str, None] = {}
 
     for entry in entries:
         entry_type = entry.get("type")
         timestamp = parse_timestamp(entry.get("timestamp", ""))
 
-        if not result["session_id"]:
-            result["session_id"] = entry.get("sessionId")
-        if not result["cwd"]:
-            result["cwd"] = entry.get("cwd")
-        if not result["git_branch"]:
-            result["git_branch"] = entry.get("gitBranch")
+        if not session_id:
+            session_id = entry.get("sessionId")
+        if not cwd:
+            cwd = entry.get("cwd")
+        if not git_branch:
+            git_branch = entry.get("gitBranch")
 
+        # Every entry counts toward the session's time span, including the
+        # ones skipped below
         if timestamp:
-            if not result["start_time"] or timestamp < result["start_time"]:
-                result["start_time"] = timestamp
-            if not result["end_time"] or timestamp > result["end_time"]:
-                result["end_time"] = timestamp
+            if not start_time or timestamp < start_time:
+                start_time = timestamp
+            if not end_time or timestamp > end_time:
+                end_time = timestamp
 
         if entry_type == "queue-operation":
             continue
@@ -147,34 +286,30 @@ def process_entries(
         if role == "user":
             if isinstance(content, str):
                 event_counter += 1
-                result["events"].append({
-                    "id": f"evt-{event_counter}",
-                    "type": "user",
-                    "timestamp": timestamp,
-                    "content": content,
-                    "tool_name": None,
-                    "tool_input": None,
-                    "tool_id": None,
-                    "files_affected": [],
-                })
-                phases = detect_phases_and_plans(content)
-                result["phases"].extend(phases)
-            elif isinstance(content, list):
+                message_count += 1
+                if summary_only:
+                    continue
+                append_event(TimelineEvent(
+                    id=f"evt-{event_counter}",
+                    type="user",
+                    timestamp=timestamp,
+                    content=content,
+                ))
+                if len(phases_found) < MAX_PHASES:
+                    _collect_unique(phases_found, detect_phases_and_plans(content), MAX_PHASES)
+            elif isinstance(content, list) and not summary_only:
                 for item in content:
                     if item.get("type") == "tool_result":
                         event_counter += 1
                         tool_id = item.get("tool_use_id", "")
                         tool_content = item.get("content", "")
-                        result["events"].append({
-                            "id": f"evt-{event_counter}",
-                            "type": "tool_result",
-                            "timestamp": timestamp,
-                            "content": tool_content if isinstance(tool_content, str) else str(tool_content),
-                            "tool_name": None,
-                            "tool_input": None,
-                            "tool_id": tool_id,
-                            "files_affected": [],
-                        })
+                        append_event(TimelineEvent(
+                            id=f"evt-{event_counter}",
+                            type="tool_result",
+                            timestamp=timestamp,
+                            content=tool_content if isinstance(tool_content, str) else str(tool_content),
+                            tool_id=tool_id,
+                        ))
 
         elif role == "assistant":
             if isinstance(content, list):
@@ -182,84 +317,119 @@ def process_entries(
                     item_type = item.get("type")
 
                     if item_type == "thinking":
-                        if include_thinking:
+                        if include_thinking and not summary_only:
                             event_counter += 1
                             thinking_text = item.get("thinking", "")
-                            result["events"].append({
-                                "id": f"evt-{event_counter}",
-                                "type": "thinking",
-                                "timestamp": timestamp,
-                                "content": thinking_text,
-                                "tool_name": None,
-                                "tool_input": None,
-                                "tool_id": None,
-                                "files_affected": [],
-                            })
+                            append_event(TimelineEvent(
+                                id=f"evt-{event_counter}",
+                                type="thinking",
+                                timestamp=timestamp,
+                                content=thinking_text,
+                            ))
 
                     elif item_type == "text":
                         event_counter += 1
+                        message_count += 1
+                        if summary_only:
+                            continue
                         text = item.get("text", "")
-                        result["events"].append({
-                            "id": f"evt-{event_counter}",
-                            "type": "assistant",
-                            "timestamp": timestamp,
-                            "content": text,
-                            "tool_name": None,
-                            "tool_input": None,
-                            "tool_id": None,
-                            "files_affected": [],
-                        })
-                        phases = detect_phases_and_plans(text)
-                        result["phases"].extend(phases)
-                        decisions = detect_decisions(text)
-                        result["decisions"].extend(decisions)
+                        append_event(TimelineEvent(
+                            id=f"evt-{event_counter}",
+                            type="assistant",
+                            timestamp=timestamp,
+                            content=text,
+                        ))
+                        if len(phases_found) < MAX_PHASES:
+                            _collect_unique(phases_found, detect_phases_and_plans(text), MAX_PHASES)
+                        if len(decisions_found) < MAX_DECISIONS:
+                            _collect_unique(decisions_found, detect_decisions(text), MAX_DECISIONS)
 
                     elif item_type == "tool_use":
                         event_counter += 1
+                        tool_count += 1
                         tool_name = item.get("name", "")
                         tool_input = item.get("input", {})
                         tool_id = item.get("id", "")
 
-                        result["tools_used"].add(tool_name)
+                        tools_used.add(tool_name)
+
+                        # Summaries only need the Read/Write/Edit paths; the
+                        # rest (e.g. the Bash regex) just feed files_affected
+                        is_file_tool = tool_name in ("Read", "Write", "Edit")
+                        if summary_only and not is_file_tool:
+                            continue
 
                         files = extract_files_from_tool_use(tool_name, tool_input)
                         if tool_name in ("Write", "Edit"):
-                            result["files_modified"].update(files)
+                            files_modified.update(files)
                         elif tool_name == "Read":
-                            result["files_read"].update(files)
-
-                        result["events"].append({
-                            "id": f"evt-{event_counter}",
-                            "type": "tool_use",
-                            "timestamp": timestamp,
-                            "content": None,
-                            "tool_name": tool_name,
-                            "tool_input": tool_input,
-                            "tool_id": tool_id,
-                            "files_affected": files,
-                        })
-
-    result["phases"] = list(dict.fromkeys(result["phases"]))[:15]
-    result["decisions"] = list(dict.fromkeys(result["decisions"]))[:15]
+                            files_read.update(files)
+
+                        if summary_only:
+                            continue
+                        append_event(TimelineEvent(
+                            id=f"evt-{event_counter}",
+                            type="tool_use",
+                            timestamp=timestamp,
+                            tool_name=tool_name,
+                            tool_input=tool_input,
+                            tool_id=tool_id,
+                            files_affected=files,
+                        ))
+
+    result["session_id"] = session_id
+    result["cwd"] = cwd
+    result["git_branch"] = git_branch
+    result["start_time"] = start_time
+    result["end_time"] = end_time
+    result["message_count"] = message_count
+    result["tool_count"] = tool_count
+    result["phases"] = list(phases_found)
+    result["decisions"] = list(decisions_found)
 
     return result
 
 
+def _summary_cache_key(filepath: Path, project_path: str, project_name: str) -> tuple:
+    """Cache key for a session file's current version."""
+    stat = filepath.stat()
+    return (filepath, stat.st_mtime_ns, stat.st_size, project_path, project_name)
+
+
 def get_session_summary(
     filepath: Path, project_path: str, project_name: str
 ) -> SessionSummary:
-    """Get lightweight session summary without full parsing."""
-    entries = parse_jsonl_file(filepath)
-    if not entries:
+    """Get lightweight session summary without full parsing.
+
+    Summaries are memoized per file version (mtime and size), so unchanged
+    logs are only parsed once.
+    """
+    key = _summary_cache_key(filepath, project_path, project_name)
+    with _summary_cache_lock:
+        summary = _summary_cache.get(key)
+    if summary is None:
+        summary = _parse_session_summary(filepath, key[2], project_path, project_name)
+        with _summary_cache_lock:
+            _summary_cache[key] = summary
+    return summary
+
+
+def _parse_session_summary(
+    filepath: Path, size: int, project_path: str, project_name: str
+) -> SessionSummary:
+    """Parse a session file into its summary."""
+    entries = iter_jsonl_file(filepath)
+    first = next(entries, None)
+    if first is None:
         return SessionSummary(
             session_id="unknown",
             project_path=project_path,
             project_name=project_name,
             file_path=str(filepath),
-            file_size_bytes=filepath.stat().st_size,
+            file_size_bytes=size,
         )
 
-    data = process_entries(entries, include_thinking=False)
+    data = process_entries(chain((first,), entries), summary_only=True)
 
     duration = None
     if data["start_time"] and data["end_time"]:
@@ -275,27 +445,103 @@ def get_session_summary(
         duration_seconds=duration,
         git_branch=data["git_branch"],
         cwd=data["cwd"],
-        message_count=len([e for e in data["events"] if e["type"] in ("user", "assistant")]),
-        tool_count=len([e for e in data["events"] if e["type"] == "tool_use"]),
+        message_count=data["message_count"],
+        tool_count=data["tool_count"],
         files_modified_count=len(data["files_modified"]),
-        file_size_bytes=filepath.stat().st_size,
+        file_size_bytes=size,
     )
 
 
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Get the shared parser process pool, starting it on first call.
+
+    Parsing is CPU-bound, so threads would serialize on the GIL. Spawn rather
+    than fork since the server process is multi-threaded.
+    """
+    global _parse_pool
+
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _parse_pool
+
+
+def discard_parse_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool (e.g. a worker was killed) so the next call starts a new one."""
+    global _parse_pool
+
+    with _parse_pool_lock:
+        if _parse_pool is pool:
+            _parse_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _summary_or_none(job: tuple[Path, str, str]) -> SessionSummary | None:
+    """Summarize one (file, project path, project name) job; None if unparseable."""
+    try:
+        return get_session_summary(*job)
+    except Exception:
+        return None
+
+
+def get_session_summaries(jobs: list[tuple[Path, str, str]]) -> list[SessionSummary]:
+    """Summarize many session files, using worker processes for large batches.
+
+    Args:
+        jobs: (file path, project path, project name) per session file
+
+    Returns:
+        Summaries in job order; files that can't be parsed are skipped
+    """
+    # Only files missing from the summary cache need parsing
+    results: list[SessionSummary | None] = [None] * len(jobs)
+    misses: list[tuple[int, tuple, tuple[Path, str, str]]] = []
+    for i, job in enumerate(jobs):
+        try:
+            key = _summary_cache_key(*job)
+        except OSError:
+            continue
+        with _summary_cache_lock:
+            results[i] = _summary_cache.get(key)
+        if results[i] is None:
+            misses.append((i, key, job))
+
+    miss_jobs = [job for _, _, job in misses]
+    parsed = None
+    if PARSE_WORKERS >= 2 and len(misses) >= PARALLEL_SUMMARY_MIN_FILES:
+        pool = get_parse_pool()
+        chunksize = max(1, len(misses) // (4 * PARSE_WORKERS))
+        try:
+            parsed = list(pool.map(_summary_or_none, miss_jobs, chunksize=chunksize))
+        except BrokenProcessPool:
+            discard_parse_pool(pool)
+        else:
+            # Workers have their own caches; keep their results in ours
+            with _summary_cache_lock:
+                for (_, key, _), summary in zip(misses, parsed, strict=True):
+                    if summary is not None:
+                        _summary_cache[key] = summary
+    if parsed is None:
+        parsed = [_summary_or_none(job) for job in miss_jobs]
+
+    for (i, _, _), summary in zip(misses, parsed, strict=True):
+        results[i] = summary
+    return [summary for summary in results if summary is not None]
+
+
 def get_session_detail(
     filepath: Path, project_path: str, project_name: str, include_thinking: bool = False
 ) -> SessionDetail:
     """Get full session details with all events."""
-    entries = parse_jsonl_file(filepath)
-    data = process_entries(entries, include_thinking=include_thinking)
+    data = process_entries(iter_jsonl_file(filepath), include_thinking=include_thinking)
 
     duration = None
     if data["start_time"] and data["end_time"]:
         duration = int((data["end_time"] - data["start_time"]).total_seconds())
 
-    events = [TimelineEvent(**e) for e in data["events"]]
-
-    return SessionDetail(
+    session = SessionDetail(
         session_id=data["session_id"] or filepath.stem,
         project_path=project_path,
         project_name=project_name,
@@ -310,8 +556,10 @@ def get_session_detail(
         tools_used=sorted(data["tools_used"]),
         phases=data["phases"],
         decisions=data["decisions"],
-        events=events,
+        events=data["events"],
     )
+    session.files = build_file_groups(session)
+    return session
 
 
 def extract_file_changes(session_detail: SessionDetail) -> list[FileChange]:
@@ -346,3 +594,29 @@ def extract_file_changes(session_detail: SessionDetail) -> list[FileChange]:
             ))
 
     return changes
+
+
+def group_file_changes(changes: list[FileChange]) -> dict[str, list[FileChange]]:
+    """Group file changes by path, preserving first-seen path order."""
+    grouped: defaultdict[str, list[FileChange]] = defaultdict(list)
+    for change in changes:
+        grouped[change.file_path].append(change)
+    # Plain dict so lookups of unknown paths on the cached result don't insert keys
+    return dict(grouped)
+
+
+def build_file_groups(session_detail: SessionDetail) -> list[FileGroup]:
+    """Build the per-file operation summary served by the /files endpoint."""
+    return [
+        FileGroup(
+            path=path,
+            operations=[
+                FileOperation(
+                    type=change.operation,
+                    timestamp=change.timestamp.isoformat() if change.timestamp else None,
+                )
+                for change in changes
+            ],
+        )
+        for path, changes in group_file_changes(extract_file_changes(session_detail)).items()
+    ]
@@ -7,19 +7,201 @@ This implementation provides:
 - Zero migration risk (JSONL remains source of truth, can rebuild at any time)
 """
 
-import json
 import logging
+import os
 import sqlite3
 import threading
+from collections.abc import Iterator
+from concurrent.futures.process import BrokenProcessPool
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
-from app.models.session import SessionDetail, SessionSummary, TimelineEvent
-from app.services.log_parser import get_session_detail, get_session_summary
+import orjson
+
+from app.models.session import (
+    EventMetadata,
+    SessionDetail,
+    SessionMetadata,
+    SessionSummary,
+    TimelineEvent,
+)
+from app.services import log_parser
+from app.services.log_parser import (
+    build_file_groups,
+    discard_parse_pool,
+    get_parse_pool,
+    get_session_detail,
+    get_session_summary,
+)
 
 logger = logging.getLogger(__name__)
 
+# Applied to every connection when it is opened. journal_mode=WAL persists in
+# the database file, so it is set once in _init_schema instead.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 MB
+    "PRAGMA mmap_size=268435456",  # 256 MB
+    "PRAGMA busy_timeout=5000",  # Wait up to 5s for locks
+    "PRAGMA wal_autocheckpoint=1000",  # pages
+    "PRAGMA foreign_keys=ON",
+)
+
+# Tables holding parsed sessions. rebuild_index loads a copy of them under
+# REBUILD_TABLE_PREFIX and swaps it in, so readers never see a partial index.
+SESSION_TABLES_SQL = """
+    -- Sessions metadata table
+    CREATE TABLE IF NOT EXISTS {prefix}sessions (
+        session_id TEXT PRIMARY KEY,
+        project_path TEXT NOT NULL,
+        project_name TEXT NOT NULL,
+        file_path TEXT NOT NULL UNIQUE,
+        start_time TEXT,
+        end_time TEXT,
+        duration_seconds INTEGER,
+        git_branch TEXT,
+        cwd TEXT,
+        message_count INTEGER DEFAULT 0,
+        tool_count INTEGER DEFAULT 0,
+        files_modified_count INTEGER DEFAULT 0,
+        file_size_bytes INTEGER DEFAULT 0,
+        indexed_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        file_mtime INTEGER  -- Track file modification time for stale detection
+    );
+
+    -- Timeline events table
+    CREATE TABLE IF NOT EXISTS {prefix}events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id TEXT NOT NULL,
+        event_id TEXT NOT NULL,
+        type TEXT NOT NULL,  -- user, assistant, tool_use, tool_result, thinking
+        timestamp TEXT,
+        content TEXT,
+        tool_name TEXT,
+        tool_input_json TEXT,  -- JSON string of tool input
+        tool_id TEXT,
+        files_affected_json TEXT,  -- JSON array of file paths
+        FOREIGN KEY(session_id) REFERENCES {prefix}sessions(session_id) ON DELETE CASCADE
+    );
+
+    CREATE INDEX IF NOT EXISTS {prefix}idx_events_session_event
+        ON {prefix}events(session_id, event_id);
+
+    -- Session metadata (files modified, files read, tools used)
+    CREATE TABLE IF NOT EXISTS {prefix}session_metadata (
+        session_id TEXT PRIMARY KEY,
+        files_modified_json TEXT,  -- JSON array
+        files_read_json TEXT,      -- JSON array
+        tools_used_json TEXT,      -- JSON array
+        phases_json TEXT,          -- JSON array
+        decisions_json TEXT,       -- JSON array
+        FOREIGN KEY(session_id) REFERENCES {prefix}sessions(session_id) ON DELETE CASCADE
+    );
+"""
+
+REBUILD_TABLE_PREFIX = "rebuild_"
+
+# rebuild_index tables, in the order they are dropped
+REBUILD_TABLES = ("session_metadata", "events", "sessions")
+
+# Events indexes that rebuild_index drops while swapping in its rows and
+# recreates afterwards. idx_events_session_event stays, serving session_id lookups.
+EVENTS_BULK_INDEXES = {
+    "idx_events_session": "CREATE INDEX IF NOT EXISTS idx_events_session ON events(session_id)",
+    "idx_events_type": "CREATE INDEX IF NOT EXISTS idx_events_type ON events(type)",
+}
+
+# Triggers that used to keep events_fts in sync; _write_session maintains
+# it directly now, so they are dropped from existing databases
+LEGACY_EVENTS_FTS_TRIGGERS = ("events_ai", "events_ad", "events_au")
+
+# Columns _row_to_event reads
+EVENT_COLUMNS_SQL = (
+    "event_id, type, timestamp, content, tool_name, tool_input_json, tool_id, files_affected_json"
+)
+
+# rebuild_index parses in worker processes once there are this many files
+PARALLEL_INDEX_MIN_FILES = 32
+
+# Sessions rebuild_index writes per transaction, so other writers (the sync
+# in index_session, the MCP server process) only ever wait for one batch
+REBUILD_BATCH_SIZE = 50
+
+IndexJob = tuple[Path, str, str]  # (JSONL file, project path, project name)
+
+
+def _parse_for_index(job: IndexJob) -> tuple[SessionSummary, SessionDetail, int] | Exception:
+    """Parse one session file for indexing.
+
+    Runs in worker processes, so errors are returned rather than raised to
+    keep one bad file from ending the whole map.
+    """
+    file_path, project_path, project_name = job
+    try:
+        summary = get_session_summary(file_path, project_path, project_name)
+        detail = get_session_detail(file_path, project_path, project_name, include_thinking=False)
+        return summary, detail, int(file_path.stat().st_mtime)
+    except Exception as e:
+        return e
+
+
+def _parsed_for_index(
+    jobs: list[IndexJob],
+) -> Iterator[tuple[SessionSummary, SessionDetail, int] | Exception]:
+    """Yield parse results in job order, from worker processes for large batches."""
+    workers = log_parser.PARSE_WORKERS
+    if workers < 2 or len(jobs) < PARALLEL_INDEX_MIN_FILES:
+        yield from map(_parse_for_index, jobs)
+        return
+
+    pool = get_parse_pool()
+    chunksize = max(1, len(jobs) // (4 * workers))
+    done = 0
+    try:
+        for result in pool.map(_parse_for_index, jobs, chunksize=chunksize):
+            yield result
+            done += 1
+    except BrokenProcessPool:
+        logger.warning("Parser worker pool broke; parsing remaining files in-process")
+        discard_parse_pool(pool)
+        yield from map(_parse_for_index, jobs[done:])
+
+
+def build_fts5_query(query: str) -> str:
+    """Convert free-text search into an FTS5 MATCH expression.
+
+    Each whitespace-separated term is quoted, so characters like (, ), * and
+    - are literal rather than syntax errors. Terms are implicitly ANDed and
+    the last one matches as a prefix, e.g. 'auth valid' -> '"auth" "valid"*'.
+    """
+    terms = ['"' + term.replace('"', '""') + '"' for term in query.split()]
+    if not terms:
+        return '""'
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def encode_session_cursor(session: SessionSummary) -> str:
+    """Build the keyset cursor that resumes a start_time listing after a session."""
+    start_time = session.start_time.isoformat() if session.start_time else ""
+    return f"{start_time}|{session.session_id}"
+
+
+def decode_session_cursor(cursor: str) -> tuple[str | None, str]:
+    """Split a session cursor into (start_time as stored, or None, session_id).
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    start_time, sep, session_id = cursor.partition("|")
+    if not sep or not session_id:
+        raise ValueError(f"Invalid session cursor: {cursor!r}")
+    if start_time:
+        datetime.fromisoformat(start_time)
+    return start_time or None, session_id
+
 
 class SessionDatabase:
     """SQLite-based session indexer with hybrid JSONL approach."""
@@ -34,71 +216,102 @@ class SessionDatabase:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         # Lock to prevent concurrent FTS5 repair operations
         self._fts5_repair_lock = threading.Lock()
+        # Serializes rebuild_index, which loads into shared tables
+        self._rebuild_lock = threading.Lock()
+        # One connection per thread, opened on first use and kept for reuse;
+        # all of them are also tracked here so close() can reach them
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
         self._init_schema()
         logger.info(f"Initialized SessionDatabase at {db_path}")
 
+    def _thread_connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening and tuning it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: transactions are managed by _get_connection.
+            # check_same_thread=False only so close() can run from any thread.
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=10.0,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.row_factory = sqlite3.Row
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
     @contextmanager
-    def _get_connection(self):
-        """Get a database connection with proper cleanup."""
-        conn = sqlite3.connect(self.db_path, timeout=10.0)
-        conn.row_factory = sqlite3.Row
-        # Enable foreign keys and set busy timeout for concurrent access
-        conn.execute("PRAGMA foreign_keys = ON")
-        conn.execute("PRAGMA busy_timeout = 5000")  # Wait up to 5s for locks
+    def _get_connection(self, write: bool = False):
+        """Get this thread's connection wrapped in a transaction.
+
+        The outermost use runs one explicit transaction; nested uses on the
+        same thread run in a savepoint so they commit or roll back together
+        with their caller.
+
+        Args:
+            write: Start with BEGIN IMMEDIATE, taking the write lock up front
+                instead of upgrading from a read lock mid-transaction
+        """
+        conn = self._thread_connection()
+        if conn.in_transaction:
+            conn.execute("SAVEPOINT nested")
+            try:
+                yield conn
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK TO nested")
+                    conn.execute("RELEASE nested")
+                raise
+            if conn.in_transaction:
+                conn.execute("RELEASE nested")
+            return
+
+        conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
         try:
             yield conn
-            conn.commit()
         except Exception:
-            conn.rollback()
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
             raise
-        finally:
+        # executescript() commits on its own, so the transaction may be gone
+        if conn.in_transaction:
+            conn.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close every thread's connection; later calls reopen lazily."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
             conn.close()
+        # A fresh thread-local drops every thread's reference at once
+        self._local = threading.local()
 
     def _init_schema(self):
         """Create tables and indexes if they don't exist."""
-        with self._get_connection() as conn:
-            conn.executescript("""
-                -- Sessions metadata table
-                CREATE TABLE IF NOT EXISTS sessions (
-                    session_id TEXT PRIMARY KEY,
-                    project_path TEXT NOT NULL,
-                    project_name TEXT NOT NULL,
-                    file_path TEXT NOT NULL UNIQUE,
-                    start_time TEXT,
-                    end_time TEXT,
-                    duration_seconds INTEGER,
-                    git_branch TEXT,
-                    cwd TEXT,
-                    message_count INTEGER DEFAULT 0,
-                    tool_count INTEGER DEFAULT 0,
-                    files_modified_count INTEGER DEFAULT 0,
-                    file_size_bytes INTEGER DEFAULT 0,
-                    indexed_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    file_mtime INTEGER  -- Track file modification time for stale detection
-                );
+        # WAL lets readers run alongside the indexer; the mode is persistent
+        conn = sqlite3.connect(self.db_path, timeout=10.0)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+        finally:
+            conn.close()
 
-                CREATE INDEX IF NOT EXISTS idx_sessions_project ON sessions(project_name);
+        with self._get_connection(write=True) as conn:
+            conn.executescript(SESSION_TABLES_SQL.format(prefix=""))
+            conn.executescript("""
+                -- Serves project filters and their default start_time ordering
+                -- without a sort step; supersedes idx_sessions_project
+                CREATE INDEX IF NOT EXISTS idx_sessions_project_time
+                    ON sessions(project_name, start_time DESC);
+                DROP INDEX IF EXISTS idx_sessions_project;
                 CREATE INDEX IF NOT EXISTS idx_sessions_start_time ON sessions(start_time);
                 CREATE INDEX IF NOT EXISTS idx_sessions_file_path ON sessions(file_path);
 
-                -- Timeline events table
-                CREATE TABLE IF NOT EXISTS events (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    session_id TEXT NOT NULL,
-                    event_id TEXT NOT NULL,
-                    type TEXT NOT NULL,  -- user, assistant, tool_use, tool_result, thinking
-                    timestamp TEXT,
-                    content TEXT,
-                    tool_name TEXT,
-                    tool_input_json TEXT,  -- JSON string of tool input
-                    tool_id TEXT,
-                    files_affected_json TEXT,  -- JSON array of file paths
-                    FOREIGN KEY(session_id) REFERENCES sessions(session_id) ON DELETE CASCADE
-                );
-
-                CREATE INDEX IF NOT EXISTS idx_events_session ON events(session_id);
-                CREATE INDEX IF NOT EXISTS idx_events_type ON events(type);
-
                 -- FTS5 full-text search index
                 CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
                     session_id UNINDEXED,
@@ -108,33 +321,6 @@ class SessionDatabase:
                     content_rowid=id
                 );
 
-                -- Triggers to keep FTS5 in sync with events table
-                CREATE TRIGGER IF NOT EXISTS events_ai AFTER INSERT ON events BEGIN
-                    INSERT INTO events_fts(rowid, session_id, event_id, content)
-                    VALUES (new.id, new.session_id, new.event_id, new.content);
-                END;
-
-                CREATE TRIGGER IF NOT EXISTS events_ad AFTER DELETE ON events BEGIN
-                    DELETE FROM events_fts WHERE rowid = old.id;
-                END;
-
-                CREATE TRIGGER IF NOT EXISTS events_au AFTER UPDATE ON events BEGIN
-                    DELETE FROM events_fts WHERE rowid = old.id;
-                    INSERT INTO events_fts(rowid, session_id, event_id, content)
-                    VALUES (new.id, new.session_id, new.event_id, new.content);
-                END;
-
-                -- Session metadata (files modified, files read, tools used)
-                CREATE TABLE IF NOT EXISTS session_metadata (
-                    session_id TEXT PRIMARY KEY,
-                    files_modified_json TEXT,  -- JSON array
-                    files_read_json TEXT,      -- JSON array
-                    tools_used_json TEXT,      -- JSON array
-                    phases_json TEXT,          -- JSON array
-                    decisions_json TEXT,       -- JSON array
-                    FOREIGN KEY(session_id) REFERENCES sessions(session_id) ON DELETE CASCADE
-                );
-
                 -- Future: Session tags for organization
                 CREATE TABLE IF NOT EXISTS session_tags (
                     session_id TEXT NOT NULL,
@@ -143,7 +329,32 @@ class SessionDatabase:
                     PRIMARY KEY (session_id, tag),
                     FOREIGN KEY(session_id) REFERENCES sessions(session_id) ON DELETE CASCADE
                 );
+
+                -- Running counters, so unfiltered totals skip COUNT(*)
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    val INTEGER NOT NULL
+                );
+
+                -- Count sessions indexed before the counter existed
+                INSERT OR IGNORE INTO meta (key, val)
+                VALUES ('session_count', (SELECT COUNT(*) FROM sessions));
+
+                -- Triggers to keep session_count in sync with sessions table.
+                -- Writers upsert and delete explicitly instead of using
+                -- INSERT OR REPLACE, whose implicit deletes skip DELETE triggers.
+                CREATE TRIGGER IF NOT EXISTS sessions_count_ai AFTER INSERT ON sessions BEGIN
+                    UPDATE meta SET val = val + 1 WHERE key = 'session_count';
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS sessions_count_ad AFTER DELETE ON sessions BEGIN
+                    UPDATE meta SET val = val - 1 WHERE key = 'session_count';
+                END;
             """)
+            for sql in EVENTS_BULK_INDEXES.values():
+                conn.execute(sql)
+            for name in LEGACY_EVENTS_FTS_TRIGGERS:
+                conn.execute(f"DROP TRIGGER IF EXISTS {name}")
             logger.debug("Database schema initialized")
 
     def index_session(self, file_path: Path, project_path: str, project_name: str) -> None:
@@ -163,78 +374,138 @@ class SessionDatabase:
 
             file_mtime = int(file_path.stat().st_mtime)
 
-            with self._get_connection() as conn:
-                # Insert/update session metadata
-                conn.execute("""
-                    INSERT OR REPLACE INTO sessions (
-                        session_id, project_path, project_name, file_path,
-                        start_time, end_time, duration_seconds, git_branch, cwd,
-                        message_count, tool_count, files_modified_count,
-                        file_size_bytes, file_mtime, indexed_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                """, (
-                    summary.session_id,
-                    summary.project_path,
-                    summary.project_name,
-                    str(file_path),
-                    summary.start_time.isoformat() if summary.start_time else None,
-                    summary.end_time.isoformat() if summary.end_time else None,
-                    summary.duration_seconds,
-                    summary.git_branch,
-                    summary.cwd,
-                    summary.message_count,
-                    summary.tool_count,
-                    summary.files_modified_count,
-                    summary.file_size_bytes,
-                    file_mtime,
-                ))
-
-                # Delete old events for this session (if re-indexing)
-                conn.execute("DELETE FROM events WHERE session_id = ?", (summary.session_id,))
-
-                # Insert timeline events
-                for event in detail.events:
-                    tool_input_json = json.dumps(event.tool_input) if event.tool_input else None
-                    files_affected_json = json.dumps(event.files_affected) if event.files_affected else None
-
-                    conn.execute("""
-                        INSERT INTO events (
-                            session_id, event_id, type, timestamp, content,
-                            tool_name, tool_input_json, tool_id, files_affected_json
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        summary.session_id,
-                        event.id,
-                        event.type,
-                        event.timestamp.isoformat() if event.timestamp else None,
-                        event.content,
-                        event.tool_name,
-                        tool_input_json,
-                        event.tool_id,
-                        files_affected_json,
-                    ))
-
-                # Store session metadata (files, tools, phases, decisions)
-                conn.execute("""
-                    INSERT OR REPLACE INTO session_metadata (
-                        session_id, files_modified_json, files_read_json,
-                        tools_used_json, phases_json, decisions_json
-                    ) VALUES (?, ?, ?, ?, ?, ?)
-                """, (
-                    summary.session_id,
-                    json.dumps(detail.files_modified),
-                    json.dumps(detail.files_read),
-                    json.dumps(detail.tools_used),
-                    json.dumps(detail.phases),
-                    json.dumps(detail.decisions),
-                ))
-
+            # One BEGIN IMMEDIATE transaction covers the session, its events
+            # and its metadata
+            with self._get_connection(write=True) as conn:
+                self._write_session(conn, file_path, summary, detail, file_mtime)
                 logger.debug(f"Indexed session {summary.session_id} from {file_path}")
 
         except Exception as e:
             logger.error(f"Failed to index session {file_path}: {e}", exc_info=True)
             raise
 
+    @staticmethod
+    def _write_session(
+        conn: sqlite3.Connection,
+        file_path: Path,
+        summary: SessionSummary,
+        detail: SessionDetail,
+        file_mtime: int,
+        index_fts: bool = True,
+        prefix: str = "",
+    ) -> None:
+        """Write one parsed session's row, events and metadata, replacing old ones.
+
+        Also keeps events_fts in sync unless index_fts is False, for bulk
+        loads that rebuild the FTS5 index afterwards. prefix selects another
+        copy of the tables (see SESSION_TABLES_SQL); events_fts only indexes
+        the unprefixed ones.
+        """
+        if index_fts:
+            # Remove the FTS5 entries of every event deleted below: this
+            # session's, and any other session's on this file
+            conn.execute("""
+                INSERT INTO events_fts(events_fts, rowid, session_id, event_id, content)
+                SELECT 'delete', id, session_id, event_id, content FROM events
+                WHERE session_id IN (
+                    SELECT session_id FROM sessions WHERE session_id = ? OR file_path = ?
+                )
+            """, (summary.session_id, str(file_path)))
+
+        # A file whose session ID changed leaves its old row behind; delete it
+        # explicitly (cascading to its events) so file_path stays unique
+        conn.execute(
+            f"DELETE FROM {prefix}sessions WHERE file_path = ? AND session_id != ?",
+            (str(file_path), summary.session_id),
+        )
+
+        # Insert/update session metadata. An upsert rather than INSERT OR
+        # REPLACE, so re-indexing is an UPDATE and the session_count triggers
+        # only see real inserts and deletes.
+        conn.execute(f"""
+            INSERT INTO {prefix}sessions (
+                session_id, project_path, project_name, file_path,
+                start_time, end_time, duration_seconds, git_branch, cwd,
+                message_count, tool_count, files_modified_count,
+                file_size_bytes, file_mtime, indexed_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(session_id) DO UPDATE SET
+                project_path = excluded.project_path,
+                project_name = excluded.project_name,
+                file_path = excluded.file_path,
+                start_time = excluded.start_time,
+                end_time = excluded.end_time,
+                duration_seconds = excluded.duration_seconds,
+                git_branch = excluded.git_branch,
+                cwd = excluded.cwd,
+                message_count = excluded.message_count,
+                tool_count = excluded.tool_count,
+                files_modified_count = excluded.files_modified_count,
+                file_size_bytes = excluded.file_size_bytes,
+                file_mtime = excluded.file_mtime,
+                indexed_at = excluded.indexed_at
+        """, (
+            summary.session_id,
+            summary.project_path,
+            summary.project_name,
+            str(file_path),
+            summary.start_time.isoformat() if summary.start_time else None,
+            summary.end_time.isoformat() if summary.end_time else None,
+            summary.duration_seconds,
+            summary.git_branch,
+            summary.cwd,
+            summary.message_count,
+            summary.tool_count,
+            summary.files_modified_count,
+            summary.file_size_bytes,
+            file_mtime,
+        ))
+
+        # Delete old events for this session (if re-indexing)
+        conn.execute(f"DELETE FROM {prefix}events WHERE session_id = ?", (summary.session_id,))
+
+        # Insert timeline events in one batch
+        conn.executemany(f"""
+            INSERT INTO {prefix}events (
+                session_id, event_id, type, timestamp, content,
+                tool_name, tool_input_json, tool_id, files_affected_json
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (
+                summary.session_id,
+                event.id,
+                event.type,
+                event.timestamp.isoformat() if event.timestamp else None,
+                event.content,
+                event.tool_name,
+                orjson.dumps(event.tool_input).decode() if event.tool_input else None,
+                event.tool_id,
+                orjson.dumps(event.files_affected).decode() if event.files_affected else None,
+            )
+            for event in detail.events
+        ])
+
+        if index_fts:
+            conn.execute("""
+                INSERT INTO events_fts(rowid, session_id, event_id, content)
+                SELECT id, session_id, event_id, content FROM events WHERE session_id = ?
+            """, (summary.session_id,))
+
+        # Store session metadata (files, tools, phases, decisions)
+        conn.execute(f"""
+            INSERT OR REPLACE INTO {prefix}session_metadata (
+                session_id, files_modified_json, files_read_json,
+                tools_used_json, phases_json, decisions_json
+            ) VALUES (?, ?, ?, ?, ?, ?)
+        """, (
+            summary.session_id,
+            orjson.dumps(detail.files_modified).decode(),
+            orjson.dumps(detail.files_read).decode(),
+            orjson.dumps(detail.tools_used).decode(),
+            orjson.dumps(detail.phases).decode(),
+            orjson.dumps(detail.decisions).decode(),
+        ))
+
     def get_sessions(
         self,
         project: str | None = None,
@@ -245,6 +516,8 @@ class SessionDatabase:
         limit: int = 20,
         order_by: str = "start_time",
         order: str = "desc",
+        exact_total: bool = True,
+        cursor: str | None = None,
     ) -> tuple[list[SessionSummary], int]:
         """Get sessions from SQLite with filtering.
 
@@ -257,6 +530,14 @@ class SessionDatabase:
             limit: Pagination limit
             order_by: Column to sort by (start_time, duration_seconds, message_count)
             order: Sort order (asc or desc)
+            exact_total: Run a COUNT query for the total. When False, one extra
+                row is fetched instead and the returned total is only a lower
+                bound, still enough to tell whether more pages exist.
+            cursor: Keyset cursor from encode_session_cursor; returns the page
+                after that session instead of using offset. Only applies when
+                ordering by start_time. No lookahead row is fetched for a
+                cursor page: callers ask for limit + 1 to detect further pages,
+                and a non-exact total is just the number of rows returned.
 
         Returns:
             Tuple of (session list, total count)
@@ -294,10 +575,13 @@ class SessionDatabase:
                 if search:
                     # Use FTS5 for full-text search on event content
                     # Also search in session metadata (project name, git branch, cwd)
+                    # session_id comes from events by rowid: reading it from the
+                    # external-content FTS table would load each event's content
                     where_clauses.append("""
                         (
                             session_id IN (
-                                SELECT DISTINCT session_id FROM events_fts
+                                SELECT e.session_id FROM events_fts
+                                JOIN events e ON e.id = events_fts.rowid
                                 WHERE events_fts MATCH ?
                             )
                             OR project_name LIKE ?
@@ -305,10 +589,7 @@ class SessionDatabase:
                             OR cwd LIKE ?
                         )
                     """)
-                    # Escape FTS5 special characters by wrapping in double quotes
-                    # This treats the search as a literal phrase, avoiding syntax errors
-                    # from characters like (, ), *, etc.
-                    search_escaped = '"' + search.replace('"', '""') + '"'
+                    search_escaped = build_fts5_query(search)
                     search_pattern = f"%{search}%"
                     params.extend([search_escaped, search_pattern, search_pattern, search_pattern])
 
@@ -323,21 +604,41 @@ class SessionDatabase:
                     order = "desc"
 
                 # Get total count
-                count_query = f"SELECT COUNT(*) FROM sessions WHERE {where_sql}"
-                total = conn.execute(count_query, params).fetchone()[0]
+                if exact_total and not where_clauses:
+                    total = self._session_count(conn)
+                elif exact_total:
+                    count_query = f"SELECT COUNT(*) FROM sessions WHERE {where_sql}"
+                    total = conn.execute(count_query, params).fetchone()[0]
 
                 # Get paginated results with dynamic ordering
                 # Handle NULL values: NULLS LAST for desc, NULLS FIRST for asc
-                nulls_handling = "NULLS LAST" if order.lower() == "desc" else "NULLS FIRST"
-                query = f"""
-                    SELECT * FROM sessions
-                    WHERE {where_sql}
-                    ORDER BY {order_by} {order.upper()} {nulls_handling}
-                    LIMIT ? OFFSET ?
-                """
-                params.extend([limit, offset])
-
-                rows = conn.execute(query, params).fetchall()
+                direction = order.upper()
+                nulls_handling = "NULLS LAST" if direction == "DESC" else "NULLS FIRST"
+                order_sql = f"{order_by} {direction} {nulls_handling}"
+                if order_by == "start_time":
+                    # Tie-break so keyset cursors see one stable order
+                    order_sql += f", session_id {direction}"
+
+                if cursor is not None and order_by == "start_time":
+                    rows = self._get_sessions_after(
+                        conn, where_sql, params, cursor, direction, order_sql, limit
+                    )
+                    if not exact_total:
+                        total = len(rows)
+                else:
+                    query = f"""
+                        SELECT * FROM sessions
+                        WHERE {where_sql}
+                        ORDER BY {order_sql}
+                        LIMIT ? OFFSET ?
+                    """
+                    # Without a COUNT, fetch one lookahead row to detect further pages
+                    params.extend([limit if exact_total else limit + 1, offset])
+
+                    rows = conn.execute(query, params).fetchall()
+                    if not exact_total:
+                        total = offset + len(rows)
+                        rows = rows[:limit]
 
                 # Convert to SessionSummary objects
                 sessions = []
@@ -364,6 +665,48 @@ class SessionDatabase:
             logger.error(f"Failed to get sessions: {e}", exc_info=True)
             raise
 
+    @staticmethod
+    def _get_sessions_after(
+        conn: sqlite3.Connection,
+        where_sql: str,
+        params: list,
+        cursor: str,
+        direction: str,
+        order_sql: str,
+        limit: int,
+    ) -> list[sqlite3.Row]:
+        """Seek to the sessions following a keyset cursor in start_time order.
+
+        The order is two runs: sessions with a start_time and, after them for
+        DESC or before them for ASC, sessions without one. Each run is read
+        with a condition SQLite can answer by seeking a start_time index; a
+        page that reaches the end of the cursor's run continues into the next.
+        """
+        cursor_time, cursor_id = decode_session_cursor(cursor)
+        op = "<" if direction == "DESC" else ">"
+        timed_after = (f"(start_time, session_id) {op} (?, ?)", [cursor_time, cursor_id])
+        timed_all = ("start_time IS NOT NULL", [])
+        untimed_after = (f"start_time IS NULL AND session_id {op} ?", [cursor_id])
+        untimed_all = ("start_time IS NULL", [])
+
+        if direction == "DESC":
+            runs = [timed_after, untimed_all] if cursor_time else [untimed_after]
+        else:
+            runs = [timed_after] if cursor_time else [untimed_after, timed_all]
+
+        rows: list[sqlite3.Row] = []
+        for condition, condition_params in runs:
+            rows += conn.execute(
+                f"""SELECT * FROM sessions
+                    WHERE {where_sql} AND {condition}
+                    ORDER BY {order_sql}
+                    LIMIT ?""",
+                [*params, *condition_params, limit - len(rows)],
+            ).fetchall()
+            if len(rows) >= limit:
+                break
+        return rows
+
     def get_session_by_id(
         self,
         session_id: str,
@@ -384,7 +727,9 @@ class SessionDatabase:
             with self._get_connection() as conn:
                 # Get session metadata
                 session_row = conn.execute(
-                    "SELECT * FROM sessions WHERE session_id = ?",
+                    """SELECT session_id, project_path, project_name, file_path, cwd,
+                              git_branch, start_time, end_time, duration_seconds, file_mtime
+                       FROM sessions WHERE session_id = ?""",
                     (session_id,)
                 ).fetchone()
 
@@ -414,48 +759,32 @@ class SessionDatabase:
 
                 # Get session metadata (files, tools, phases)
                 metadata_row = conn.execute(
-                    "SELECT * FROM session_metadata WHERE session_id = ?",
+                    """SELECT files_modified_json, files_read_json, tools_used_json,
+                              phases_json, decisions_json
+                       FROM session_metadata WHERE session_id = ?""",
                     (session_id,)
                 ).fetchone()
 
-                # Get all events for this session
+                # Get the session's events, skipping thinking unless requested
                 event_rows = conn.execute(
-                    """SELECT * FROM events
-                       WHERE session_id = ?
-                       ORDER BY id ASC""",
-                    (session_id,)
+                    f"""SELECT {EVENT_COLUMNS_SQL} FROM events
+                        WHERE session_id = ? AND (? OR type != 'thinking')
+                        ORDER BY id ASC""",
+                    (session_id, include_thinking)
                 ).fetchall()
 
-                # Filter thinking events if not requested
-                if not include_thinking:
-                    event_rows = [row for row in event_rows if row["type"] != "thinking"]
-
                 # Reconstruct TimelineEvent objects
-                events = []
-                for row in event_rows:
-                    tool_input = json.loads(row["tool_input_json"]) if row["tool_input_json"] else None
-                    files_affected = json.loads(row["files_affected_json"]) if row["files_affected_json"] else []
-
-                    events.append(TimelineEvent(
-                        id=row["event_id"],
-                        type=row["type"],
-                        timestamp=datetime.fromisoformat(row["timestamp"]) if row["timestamp"] else None,
-                        content=row["content"],
-                        tool_name=row["tool_name"],
-                        tool_input=tool_input,
-                        tool_id=row["tool_id"],
-                        files_affected=files_affected,
-                    ))
+                events = [self._row_to_event(row) for row in event_rows]
 
                 # Reconstruct metadata
-                files_modified = json.loads(metadata_row["files_modified_json"]) if metadata_row and metadata_row["files_modified_json"] else []
-                files_read = json.loads(metadata_row["files_read_json"]) if metadata_row and metadata_row["files_read_json"] else []
-                tools_used = json.loads(metadata_row["tools_used_json"]) if metadata_row and metadata_row["tools_used_json"] else []
-                phases = json.loads(metadata_row["phases_json"]) if metadata_row and metadata_row["phases_json"] else []
-                decisions = json.loads(metadata_row["decisions_json"]) if metadata_row and metadata_row["decisions_json"] else []
+                files_modified = self._json_list(metadata_row, "files_modified_json")
+                files_read = self._json_list(metadata_row, "files_read_json")
+                tools_used = self._json_list(metadata_row, "tools_used_json")
+                phases = self._json_list(metadata_row, "phases_json")
+                decisions = self._json_list(metadata_row, "decisions_json")
 
                 # Reconstruct SessionDetail
-                return SessionDetail(
+                session = SessionDetail(
                     session_id=session_row["session_id"],
                     project_path=session_row["project_path"],
                     project_name=session_row["project_name"],
@@ -472,6 +801,8 @@ class SessionDatabase:
                     decisions=decisions,
                     events=events,
                 )
+                session.files = build_file_groups(session)
+                return session
 
         except Exception as e:
             logger.error(f"Failed to get session {session_id}: {e}", exc_info=True)
@@ -495,6 +826,199 @@ class SessionDatabase:
                 pass
             return None
 
+    def get_timeline(
+        self,
+        session_id: str,
+        event_types: list[str] | None = None,
+        offset: int = 0,
+        limit: int = 50,
+        include_thinking: bool = False,
+    ) -> tuple[list[TimelineEvent], int, str] | None:
+        """Get a filtered, paginated window of session events from SQLite.
+
+        Filtering and slicing happen in SQL so only the requested events
+        are decoded.
+
+        Args:
+            session_id: Session ID to retrieve events for
+            event_types: Only include events of these types (all if None)
+            offset: Pagination offset
+            limit: Pagination limit
+            include_thinking: Whether to include thinking blocks
+
+        Returns:
+            Tuple of (event list, total matching count, JSONL file path), or
+            None if the session is not indexed or its JSONL file is missing/stale
+        """
+        with self._get_connection() as conn:
+            file_path = self._is_index_fresh(conn, session_id)
+            if not file_path:
+                return None
+
+            where_sql = """
+                session_id = ?1
+                AND (?2 IS NULL OR type IN (SELECT value FROM json_each(?2)))
+                AND (?3 OR type != 'thinking')
+            """
+            params = [
+                session_id,
+                orjson.dumps(event_types).decode() if event_types else None,
+                include_thinking,
+            ]
+
+            total = conn.execute(
+                f"SELECT COUNT(*) FROM events WHERE {where_sql}", params
+            ).fetchone()[0]
+
+            event_rows = conn.execute(
+                f"""SELECT {EVENT_COLUMNS_SQL} FROM events
+                    WHERE {where_sql}
+                    ORDER BY id ASC
+                    LIMIT ?4 OFFSET ?5""",
+                params + [limit, offset],
+            ).fetchall()
+
+            return [self._row_to_event(row) for row in event_rows], total, file_path
+
+    def search_session_events(
+        self,
+        session_id: str,
+        query: str,
+        limit: int,
+    ) -> list[tuple[int, int]] | None:
+        """Find events in one session whose content contains a substring.
+
+        Matching is case-insensitive for ASCII, like ``query in content.lower()``
+        with an already-lowercased query. Thinking events are skipped, and
+        results are positions in the session's non-thinking event list so
+        they line up with a session loaded with include_thinking=False.
+
+        Args:
+            session_id: Session ID to search
+            query: Lowercased search text
+            limit: Maximum number of matches to return
+
+        Returns:
+            (event index, match offset) pairs in event order, or None if the
+            session is not indexed or its JSONL file is missing/stale
+        """
+        with self._get_connection() as conn:
+            if not self._is_index_fresh(conn, session_id):
+                return None
+
+            rows = conn.execute(
+                """SELECT idx, pos - 1 AS match_pos FROM (
+                       SELECT ROW_NUMBER() OVER (ORDER BY id) - 1 AS idx,
+                              instr(lower(content), ?) AS pos
+                       FROM events
+                       WHERE session_id = ? AND type != 'thinking'
+                   )
+                   WHERE pos > 0
+                   ORDER BY idx
+                   LIMIT ?""",
+                (query, session_id, limit),
+            ).fetchall()
+
+            return [(row["idx"], row["match_pos"]) for row in rows]
+
+    def get_session_metadata(self, session_id: str) -> SessionMetadata | None:
+        """Get session details and aggregates without loading its events.
+
+        Events are only counted (thinking excluded), never decoded.
+
+        Returns:
+            SessionMetadata, or None if the session is not indexed or its
+            JSONL file is missing/stale
+        """
+        with self._get_connection() as conn:
+            if not self._is_index_fresh(conn, session_id):
+                return None
+
+            row = conn.execute(
+                """SELECT s.*, m.files_modified_json, m.files_read_json, m.tools_used_json,
+                          m.phases_json, m.decisions_json,
+                          (SELECT COUNT(*) FROM events e
+                           WHERE e.session_id = s.session_id AND e.type != 'thinking') AS event_count
+                   FROM sessions s
+                   LEFT JOIN session_metadata m ON m.session_id = s.session_id
+                   WHERE s.session_id = ?""",
+                (session_id,),
+            ).fetchone()
+
+            return SessionMetadata(
+                session_id=row["session_id"],
+                project_path=row["project_path"],
+                project_name=row["project_name"],
+                file_path=row["file_path"],
+                cwd=row["cwd"],
+                git_branch=row["git_branch"],
+                start_time=datetime.fromisoformat(row["start_time"]) if row["start_time"] else None,
+                end_time=datetime.fromisoformat(row["end_time"]) if row["end_time"] else None,
+                duration_seconds=row["duration_seconds"],
+                event_count=row["event_count"],
+                files_modified=self._json_list(row, "files_modified_json"),
+                files_read=self._json_list(row, "files_read_json"),
+                tools_used=self._json_list(row, "tools_used_json"),
+                phases=self._json_list(row, "phases_json"),
+                decisions=self._json_list(row, "decisions_json"),
+            )
+
+    def get_event_metadata(self, session_id: str, event_id: str) -> EventMetadata | None:
+        """Get one event's type and timestamp plus its session's project info.
+
+        Reads a single indexed row instead of reconstructing the session.
+        Thinking events are skipped, matching a session loaded without them.
+
+        Returns:
+            EventMetadata, or None if the session is not indexed, its JSONL
+            file is missing/stale, or the event doesn't exist
+        """
+        with self._get_connection() as conn:
+            if not self._is_index_fresh(conn, session_id):
+                return None
+
+            row = conn.execute(
+                """SELECT e.type, e.timestamp, s.project_name, s.git_branch
+                   FROM events e
+                   JOIN sessions s ON s.session_id = e.session_id
+                   WHERE e.session_id = ? AND e.event_id = ? AND e.type != 'thinking'
+                   LIMIT 1""",
+                (session_id, event_id),
+            ).fetchone()
+
+            if not row:
+                return None
+
+            return EventMetadata(
+                event_type=row["type"],
+                event_timestamp=datetime.fromisoformat(row["timestamp"]) if row["timestamp"] else None,
+                project_name=row["project_name"],
+                git_branch=row["git_branch"],
+            )
+
+    @staticmethod
+    def _is_index_fresh(conn: sqlite3.Connection, session_id: str) -> str | None:
+        """Check a session is indexed and its JSONL file hasn't changed since.
+
+        Returns:
+            The session's file path if its index is fresh, otherwise None
+        """
+        session_row = conn.execute(
+            "SELECT file_path, file_mtime FROM sessions WHERE session_id = ?",
+            (session_id,)
+        ).fetchone()
+
+        if not session_row:
+            return None
+
+        file_path = Path(session_row["file_path"])
+        try:
+            if int(file_path.stat().st_mtime) <= session_row["file_mtime"]:
+                return session_row["file_path"]
+        except OSError:
+            pass
+        return None
+
     def check_stale_sessions(self, projects_dir: Path) -> list[Path]:
         """Find JSONL files that are newer than their index or not indexed.
 
@@ -505,34 +1029,45 @@ class SessionDatabase:
             List of stale/missing JSONL file paths
         """
         stale_files = []
+        new_files = []
 
         try:
             with self._get_connection() as conn:
-                rows = conn.execute(
-                    "SELECT file_path, file_mtime FROM sessions"
-                ).fetchall()
-
-                indexed_files = {}
-                for row in rows:
-                    indexed_files[row["file_path"]] = row["file_mtime"]
+                indexed_files = dict(
+                    conn.execute("SELECT file_path, file_mtime FROM sessions").fetchall()
+                )
 
-            # Check if indexed files are stale
-            for file_path_str, indexed_mtime in indexed_files.items():
+            # One directory pass over top-level JSONL files in project dirs:
+            # one stat per file, compared against the index as we go
+            unseen = set(indexed_files)
+            if projects_dir.exists():
+                with os.scandir(projects_dir) as project_dirs:
+                    project_paths = [
+                        d.path for d in project_dirs
+                        if d.is_dir() and not d.name.startswith(".")
+                    ]
+                for project_path in project_paths:
+                    with os.scandir(project_path) as entries:
+                        for entry in entries:
+                            if not entry.name.endswith(".jsonl") or not entry.is_file():
+                                continue
+                            indexed_mtime = indexed_files.get(entry.path)
+                            if indexed_mtime is None:
+                                new_files.append(Path(entry.path))
+                                continue
+                            unseen.discard(entry.path)
+                            if int(entry.stat().st_mtime) > indexed_mtime:
+                                stale_files.append(Path(entry.path))
+
+            # Indexed files outside that tree (e.g. from an earlier projects dir)
+            for file_path_str in unseen:
                 file_path = Path(file_path_str)
                 if file_path.exists():
                     current_mtime = int(file_path.stat().st_mtime)
-                    if current_mtime > indexed_mtime:
+                    if current_mtime > indexed_files[file_path_str]:
                         stale_files.append(file_path)
 
-            # Find new files not in index (only top-level JSONL files in project dirs)
-            if projects_dir.exists():
-                for project_dir in projects_dir.iterdir():
-                    if not project_dir.is_dir() or project_dir.name.startswith("."):
-                        continue
-                    for jsonl_file in project_dir.glob("*.jsonl"):
-                        if str(jsonl_file) not in indexed_files:
-                            stale_files.append(jsonl_file)
-
+            stale_files.extend(new_files)
             logger.debug(f"Found {len(stale_files)} stale/new session files")
             return stale_files
 
@@ -543,7 +1078,14 @@ class SessionDatabase:
     def rebuild_index(self, projects_dir: Path) -> int:
         """Rebuild entire index from JSONL files.
 
-        Safe to call at any time - uses JSONL as source of truth.
+        Safe to call at any time - uses JSONL as source of truth. Sessions
+        are loaded into a copy of the tables (REBUILD_TABLE_PREFIX) in batches
+        of REBUILD_BATCH_SIZE, each in its own short transaction, so other
+        writers are never locked out for the whole rebuild. Readers keep
+        seeing the old index meanwhile; one final transaction swaps the new
+        rows in and rebuilds FTS5 and the secondary events indexes over them.
+        If loading fails, the old index is left as it was. Large rebuilds
+        parse files in worker processes.
 
         Args:
             projects_dir: Root directory containing project folders
@@ -555,33 +1097,62 @@ class SessionDatabase:
         count = 0
 
         try:
-            with self._get_connection() as conn:
-                # Clear all data
-                conn.execute("DELETE FROM sessions")
-                logger.debug("Cleared existing index")
+            jobs: list[IndexJob] = []
+            if projects_dir.exists():
+                for project_dir in projects_dir.iterdir():
+                    if not project_dir.is_dir() or project_dir.name.startswith("."):
+                        continue
 
-            # Re-index all JSONL files
-            if not projects_dir.exists():
+                    project_path = self._decode_project_path(project_dir.name)
+                    project_name = Path(project_path).name
+                    jobs.extend(
+                        (jsonl_file, project_path, project_name)
+                        for jsonl_file in project_dir.glob("*.jsonl")
+                    )
+            else:
                 logger.warning(f"Projects directory not found: {projects_dir}")
-                return 0
 
-            for project_dir in projects_dir.iterdir():
-                if not project_dir.is_dir() or project_dir.name.startswith("."):
-                    continue
+            # Concurrent rebuilds would load into the same tables
+            with self._rebuild_lock:
+                with self._get_connection(write=True) as conn:
+                    # Left over if an earlier rebuild's process died mid-load
+                    self._drop_rebuild_tables(conn)
+                    conn.executescript(SESSION_TABLES_SQL.format(prefix=REBUILD_TABLE_PREFIX))
 
-                project_path = self._decode_project_path(project_dir.name)
-                project_name = Path(project_path).name
-
-                for jsonl_file in project_dir.glob("*.jsonl"):
-                    try:
-                        self.index_session(jsonl_file, project_path, project_name)
-                        count += 1
-                    except Exception as e:
-                        logger.error(f"Failed to index {jsonl_file}: {e}")
-                        continue
+                try:
+                    # Re-index all JSONL files. Workers parse ahead while this
+                    # thread inserts results in file order.
+                    batch: list[tuple[Path, tuple[SessionSummary, SessionDetail, int]]] = []
+                    results = _parsed_for_index(jobs)
+                    for (jsonl_file, _, _), result in zip(jobs, results, strict=True):
+                        if isinstance(result, Exception):
+                            logger.error(f"Failed to index {jsonl_file}: {result}")
+                            continue
+                        batch.append((jsonl_file, result))
+                        if len(batch) >= REBUILD_BATCH_SIZE:
+                            count += self._write_rebuild_batch(batch)
+                            batch = []
+                    if batch:
+                        count += self._write_rebuild_batch(batch)
+                except Exception:
+                    with self._get_connection(write=True) as conn:
+                        self._drop_rebuild_tables(conn)
+                    raise
 
-            # Rebuild FTS5 index to ensure consistency
-            self._rebuild_fts5()
+                with self._get_connection(write=True) as conn:
+                    for name in EVENTS_BULK_INDEXES:
+                        conn.execute(f"DROP INDEX IF EXISTS {name}")
+                    # Cascades to events and session_metadata
+                    conn.execute("DELETE FROM sessions")
+                    for table in reversed(REBUILD_TABLES):
+                        conn.execute(
+                            f"INSERT INTO {table} SELECT * FROM {REBUILD_TABLE_PREFIX}{table}"
+                        )
+                    # Index everything inserted above in one pass
+                    conn.execute("INSERT INTO events_fts(events_fts) VALUES('rebuild')")
+                    for sql in EVENTS_BULK_INDEXES.values():
+                        conn.execute(sql)
+                    self._drop_rebuild_tables(conn)
 
             logger.info(f"Rebuild complete: indexed {count} sessions")
             return count
@@ -590,13 +1161,42 @@ class SessionDatabase:
             logger.error(f"Failed to rebuild index: {e}", exc_info=True)
             raise
 
+    @staticmethod
+    def _drop_rebuild_tables(conn: sqlite3.Connection) -> None:
+        """Drop rebuild_index's copy of the session tables, if present."""
+        for table in REBUILD_TABLES:
+            conn.execute(f"DROP TABLE IF EXISTS {REBUILD_TABLE_PREFIX}{table}")
+
+    def _write_rebuild_batch(
+        self, batch: list[tuple[Path, tuple[SessionSummary, SessionDetail, int]]]
+    ) -> int:
+        """Write parsed sessions into rebuild_index's tables in one transaction.
+
+        Returns:
+            Number of sessions written
+        """
+        count = 0
+        with self._get_connection(write=True) as conn:
+            for jsonl_file, parsed in batch:
+                try:
+                    # Savepoint, so a failed session leaves no partial rows
+                    with self._get_connection(write=True):
+                        self._write_session(
+                            conn, jsonl_file, *parsed,
+                            index_fts=False, prefix=REBUILD_TABLE_PREFIX,
+                        )
+                    count += 1
+                except Exception as e:
+                    logger.error(f"Failed to index {jsonl_file}: {e}")
+        return count
+
     def _rebuild_fts5(self) -> None:
         """Rebuild the FTS5 index to fix any corruption.
 
         This should be called after bulk inserts or when FTS5 corruption is detected.
         """
         try:
-            with self._get_connection() as conn:
+            with self._get_connection(write=True) as conn:
                 conn.execute("INSERT INTO events_fts(events_fts) VALUES('rebuild')")
                 logger.info("FTS5 index rebuilt successfully")
         except Exception as e:
@@ -648,8 +1248,7 @@ class SessionDatabase:
         """
         try:
             with self._get_connection() as conn:
-                count = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
-                return count
+                return self._session_count(conn)
         except Exception as e:
             logger.error(f"Failed to get session count: {e}", exc_info=True)
             return 0
@@ -660,13 +1259,41 @@ class SessionDatabase:
         This does NOT delete JSONL files - they remain as source of truth.
         """
         try:
-            with self._get_connection() as conn:
+            with self._get_connection(write=True) as conn:
                 conn.execute("DELETE FROM sessions")
+                conn.execute("INSERT INTO events_fts(events_fts) VALUES('delete-all')")
                 logger.info("Index cleared")
         except Exception as e:
             logger.error(f"Failed to clear index: {e}", exc_info=True)
             raise
 
+    @staticmethod
+    def _session_count(conn: sqlite3.Connection) -> int:
+        """Read the trigger-maintained number of indexed sessions."""
+        return conn.execute("SELECT val FROM meta WHERE key = 'session_count'").fetchone()[0]
+
+    @staticmethod
+    def _json_list(row: sqlite3.Row | None, column: str) -> list:
+        """Decode a JSON array column, treating a missing row or NULL as empty."""
+        return orjson.loads(row[column]) if row and row[column] else []
+
+    @staticmethod
+    def _row_to_event(row: sqlite3.Row) -> TimelineEvent:
+        """Reconstruct a TimelineEvent from an events table row."""
+        tool_input = orjson.loads(row["tool_input_json"]) if row["tool_input_json"] else None
+        files_affected = orjson.loads(row["files_affected_json"]) if row["files_affected_json"] else []
+
+        return TimelineEvent(
+            id=row["event_id"],
+            type=row["type"],
+            timestamp=datetime.fromisoformat(row["timestamp"]) if row["timestamp"] else None,
+            content=row["content"],
+            tool_name=row["tool_name"],
+            tool_input=tool_input,
+            tool_id=row["tool_id"],
+            files_affected=files_affected,
+        )
+
     def _decode_project_path(self, encoded_name: str) -> str:
         """Decode project directory name to original path.
 
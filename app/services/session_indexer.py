@@ -1,14 +1,30 @@
 """Session indexer service - discovers and caches session metadata."""
 
 import logging
+import threading
 from datetime import UTC, datetime
 from pathlib import Path
 
-from cachetools import TTLCache
+import orjson
+from cachetools import LRUCache, TTLCache
 
 from app.config import settings
-from app.models.session import SessionDetail, SessionSummary
-from app.services.log_parser import get_session_detail, get_session_summary
+from app.models.session import (
+    EventMetadata,
+    FileChange,
+    SessionDetail,
+    SessionMetadata,
+    SessionSummary,
+    TimelineEvent,
+)
+from app.services.log_parser import (
+    extract_file_changes,
+    get_session_detail,
+    get_session_summaries,
+    group_file_changes,
+)
+from app.services.session_db import decode_session_cursor
+from app.utils import ORJSON_OPTIONS
 
 # Import SQLite backend if enabled
 if settings.use_sqlite_index:
@@ -26,6 +42,11 @@ def _get_sort_time(dt: datetime | None) -> datetime:
     return dt
 
 
+def _session_time_key(session: SessionSummary) -> tuple[datetime, str]:
+    """Sort key for start_time ordering, tie-broken by session ID like SQLite."""
+    return _get_sort_time(session.start_time), session.session_id
+
+
 def _search_in_file(file_path: Path, search_term: str) -> bool:
     """Search for a term in a session file's content."""
     try:
@@ -35,6 +56,11 @@ def _search_in_file(file_path: Path, search_term: str) -> bool:
         return False
 
 
+def _file_cached_size(entry: tuple) -> int:
+    """Size of a (file path, mtime_ns, value, size) cache entry."""
+    return entry[3]
+
+
 class SessionIndexer:
     """Discovers and indexes Claude Code sessions from the projects directory."""
 
@@ -43,6 +69,25 @@ class SessionIndexer:
             maxsize=settings.cache_max_size,
             ttl=settings.cache_ttl_seconds
         )
+        # Full sessions and values derived from them, which can be many MB
+        # each, so bounded by total JSONL size rather than entry count
+        self._session_cache = LRUCache(
+            maxsize=settings.session_cache_max_bytes,
+            getsizeof=_file_cached_size,
+        )
+        # Serialized sessions and SQLite timeline pages, each bounded by
+        # encoded size so neither can evict the other or the sessions
+        self._json_cache = LRUCache(
+            maxsize=settings.session_json_cache_max_bytes,
+            getsizeof=_file_cached_size,
+        )
+        self._timeline_cache = LRUCache(
+            maxsize=settings.timeline_cache_max_bytes,
+            getsizeof=_file_cached_size,
+        )
+        # cachetools caches aren't thread-safe; the MCP server calls in from
+        # worker threads
+        self._cache_lock = threading.Lock()
 
         # Initialize SQLite backend if enabled
         self.db: SessionDatabase | None = None
@@ -129,17 +174,25 @@ class SessionIndexer:
             logger.error(f"Failed to sync index: {e}", exc_info=True)
 
     def get_projects(self) -> list[dict]:
-        """List all projects in the Claude projects directory."""
-        cache_key = "projects"
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        """List all projects in the Claude projects directory.
 
+        Cached results are keyed on the projects directory mtime, so adding or
+        removing a project invalidates them immediately; session counts within
+        a project refresh when the TTL expires.
+        """
         projects = []
         projects_dir = settings.claude_projects_dir
 
         if not projects_dir.exists():
             return projects
 
+        cache_key = "projects"
+        dir_mtime_ns = projects_dir.stat().st_mtime_ns
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+        if cached and cached[0] == dir_mtime_ns:
+            return cached[1]
+
         for project_dir in sorted(projects_dir.iterdir()):
             if not project_dir.is_dir():
                 continue
@@ -158,7 +211,8 @@ class SessionIndexer:
                 "path": str(project_dir),
             })
 
-        self._cache[cache_key] = projects
+        with self._cache_lock:
+            self._cache[cache_key] = (dir_mtime_ns, projects)
         return projects
 
     def get_sessions(
@@ -171,11 +225,18 @@ class SessionIndexer:
         limit: int = 20,
         order_by: str = "start_time",
         order: str = "desc",
+        exact_total: bool = True,
+        cursor: str | None = None,
     ) -> tuple[list[SessionSummary], int]:
         """Get sessions with optional filtering.
 
         Uses SQLite backend if enabled for 100x faster search.
         Falls back to TTLCache + file scanning if SQLite unavailable.
+
+        With exact_total=False the SQLite backend skips its COUNT query and
+        the returned total is only a lower bound (enough to derive has_more).
+        A cursor (see encode_session_cursor) replaces offset when ordering by
+        start_time.
         """
         # Use SQLite backend if available
         if self.db:
@@ -189,6 +250,8 @@ class SessionIndexer:
                     limit=limit,
                     order_by=order_by,
                     order=order,
+                    exact_total=exact_total,
+                    cursor=cursor,
                 )
             except Exception as e:
                 logger.error(f"SQLite query failed, falling back to file scan: {e}")
@@ -198,9 +261,9 @@ class SessionIndexer:
         cache_key = f"sessions:{project}:{date_from}:{date_to}:{search}"
 
         # Get all sessions (possibly from cache)
-        if cache_key in self._cache:
-            all_sessions = self._cache[cache_key]
-        else:
+        with self._cache_lock:
+            all_sessions = self._cache.get(cache_key)
+        if all_sessions is None:
             all_sessions = self._scan_sessions(project)
 
             # Apply date filters
@@ -230,7 +293,8 @@ class SessionIndexer:
                         filtered_sessions.append(s)
                 all_sessions = filtered_sessions
 
-            self._cache[cache_key] = all_sessions
+            with self._cache_lock:
+                self._cache[cache_key] = all_sessions
 
         # Sort by specified field
         reverse = order.lower() == "desc"
@@ -245,24 +309,32 @@ class SessionIndexer:
                 reverse=reverse
             )
         else:
-            # Default: sort by start_time
-            all_sessions.sort(
-                key=lambda s: _get_sort_time(s.start_time),
-                reverse=reverse
-            )
+            # Default: sort by start_time, tie-broken like the SQLite backend
+            all_sessions.sort(key=_session_time_key, reverse=reverse)
 
         total = len(all_sessions)
-        paginated = all_sessions[offset:offset + limit]
+        if cursor is not None and order_by == "start_time":
+            cursor_time, cursor_id = decode_session_cursor(cursor)
+            cursor_key = (
+                _get_sort_time(datetime.fromisoformat(cursor_time) if cursor_time else None),
+                cursor_id,
+            )
+            # Sessions strictly after the cursor in the sort direction
+            paginated = [
+                s for s in all_sessions
+                if (_session_time_key(s) < cursor_key if reverse else _session_time_key(s) > cursor_key)
+            ][:limit]
+        else:
+            paginated = all_sessions[offset:offset + limit]
 
         return paginated, total
 
     def _scan_sessions(self, project: str | None = None) -> list[SessionSummary]:
         """Scan projects directory for sessions."""
-        sessions = []
         projects_dir = settings.claude_projects_dir
 
         if not projects_dir.exists():
-            return sessions
+            return []
 
         if project:
             # Scan single project
@@ -274,6 +346,7 @@ class SessionIndexer:
                 if d.is_dir() and not d.name.startswith(".")
             ]
 
+        jobs = []
         for project_dir in project_dirs:
             if not project_dir.exists():
                 continue
@@ -281,19 +354,13 @@ class SessionIndexer:
             project_path = self._decode_project_path(project_dir.name)
             project_name = self._get_project_name(project_dir.name)
 
-            for jsonl_file in project_dir.glob("*.jsonl"):
-                try:
-                    summary = get_session_summary(
-                        jsonl_file,
-                        project_path=project_path,
-                        project_name=project_name,
-                    )
-                    sessions.append(summary)
-                except Exception:
-                    # Skip files that can't be parsed
-                    continue
+            jobs.extend(
+                (jsonl_file, project_path, project_name)
+                for jsonl_file in project_dir.glob("*.jsonl")
+            )
 
-        return sessions
+        # Files that can't be parsed are skipped
+        return get_session_summaries(jobs)
 
     def get_session_by_id(
         self,
@@ -302,6 +369,26 @@ class SessionIndexer:
     ) -> SessionDetail | None:
         """Get full session details by session ID.
 
+        Loaded sessions are cached and revalidated against the JSONL file's
+        mtime, so unchanged sessions are neither re-read nor re-parsed.
+        """
+        cache_key = f"session:{session_id}:{include_thinking}"
+        session = self._get_file_cached(self._session_cache, cache_key)
+        if session is not None:
+            return session
+
+        session = self._load_session(session_id, include_thinking)
+        if session:
+            self._set_file_cached(self._session_cache, cache_key, session.file_path, session)
+        return session
+
+    def _load_session(
+        self,
+        session_id: str,
+        include_thinking: bool = False
+    ) -> SessionDetail | None:
+        """Load full session details, bypassing the session cache.
+
         Uses SQLite backend if enabled for instant retrieval.
         Falls back to file scanning if SQLite unavailable.
         """
@@ -355,13 +442,279 @@ class SessionIndexer:
 
         return None
 
+    def get_timeline(
+        self,
+        session_id: str,
+        event_types: list[str] | None = None,
+        offset: int = 0,
+        limit: int = 50,
+        include_thinking: bool = False,
+    ) -> tuple[list[TimelineEvent], int] | None:
+        """Get a filtered, paginated window of a session's timeline events.
+
+        Pages are sliced from the cached session when it is already loaded, so
+        its events (and their serialized bytes) are reused. Otherwise uses the
+        SQLite backend if enabled so only the requested window is decoded, and
+        falls back to filtering the full session in a single pass. SQLite pages
+        are kept in their own size-bounded cache against the session file's
+        mtime, so re-fetching a page reuses its events' serialized bytes too.
+
+        Returns:
+            Tuple of (event list, total matching count), or None if not found
+        """
+        session = self._get_file_cached(
+            self._session_cache, f"session:{session_id}:{include_thinking}"
+        )
+        if session is not None:
+            return self._paginate_events(session.events, event_types, offset, limit)
+
+        if self.db:
+            types_key = ",".join(sorted(set(event_types))) if event_types else ""
+            cache_key = f"timeline:{session_id}:{include_thinking}:{types_key}:{offset}:{limit}"
+            page = self._get_file_cached(self._timeline_cache, cache_key)
+            if page is not None:
+                return page
+
+            try:
+                result = self.db.get_timeline(
+                    session_id,
+                    event_types=event_types,
+                    offset=offset,
+                    limit=limit,
+                    include_thinking=include_thinking,
+                )
+                if result is not None:
+                    events, total, file_path = result
+                    # Serialize now: the route needs the bytes anyway, and
+                    # they are what the page costs to keep
+                    size = sum(len(event.to_json_bytes()) for event in events)
+                    self._set_file_cached(
+                        self._timeline_cache, cache_key, file_path, (events, total), size
+                    )
+                    return events, total
+                # Not indexed or stale, fall through to full session load
+            except Exception as e:
+                logger.error(f"SQLite query failed, falling back to file scan: {e}")
+
+        session = self.get_session_by_id(session_id, include_thinking=include_thinking)
+        if not session:
+            return None
+
+        return self._paginate_events(session.events, event_types, offset, limit)
+
+    def get_session_metadata(self, session_id: str) -> SessionMetadata | None:
+        """Get session details and aggregates without its events (thinking excluded).
+
+        Reuses the cached session when it's already loaded; otherwise uses
+        SQLite backend if enabled so no events are decoded, and falls back
+        to loading the full session.
+        """
+        session = self._get_file_cached(self._session_cache, f"session:{session_id}:False")
+        if session is None and self.db:
+            try:
+                result = self.db.get_session_metadata(session_id)
+                if result is not None:
+                    return result
+            except Exception as e:
+                logger.error(f"SQLite query failed, falling back to file scan: {e}")
+
+        if session is None:
+            session = self.get_session_by_id(session_id, include_thinking=False)
+            if not session:
+                return None
+
+        return SessionMetadata(
+            **session.model_dump(exclude={"events"}),
+            event_count=len(session.events),
+        )
+
+    def get_event_metadata(self, session_id: str, event_id: str) -> EventMetadata | None:
+        """Get the fields a bookmark denormalizes from an event and its session.
+
+        Uses SQLite backend if enabled to read a single row. Falls back to
+        loading the session and scanning its events otherwise.
+
+        Returns:
+            EventMetadata, or None if the session or event is not found
+        """
+        if self.db:
+            try:
+                result = self.db.get_event_metadata(session_id, event_id)
+                if result is not None:
+                    return result
+            except Exception as e:
+                logger.error(f"SQLite query failed, falling back to file scan: {e}")
+
+        session = self.get_session_by_id(session_id)
+        if not session:
+            return None
+
+        for event in session.events:
+            if event.id == event_id:
+                return EventMetadata(
+                    event_type=event.type,
+                    event_timestamp=event.timestamp,
+                    project_name=session.project_name,
+                    git_branch=session.git_branch,
+                )
+        return None
+
+    def search_session_events(
+        self,
+        session_id: str,
+        query: str,
+        limit: int,
+    ) -> list[tuple[int, int]] | None:
+        """Find a session's events whose content contains query, ignoring case.
+
+        Uses SQLite backend if enabled so only matching positions come back
+        and no event content is lowercased in Python. Falls back to scanning
+        the loaded session for non-ASCII queries (SQLite's lower() only folds
+        ASCII) or when the session isn't indexed.
+
+        Returns:
+            (event index, match offset) pairs, indexing the session's events
+            without thinking, or None if the session is not found
+        """
+        query_lower = query.lower()
+
+        if self.db and query and query.isascii():
+            try:
+                result = self.db.search_session_events(session_id, query_lower, limit)
+                if result is not None:
+                    return result
+            except Exception as e:
+                logger.error(f"SQLite query failed, falling back to file scan: {e}")
+
+        session = self.get_session_by_id(session_id, include_thinking=False)
+        if not session:
+            return None
+
+        matches = []
+        for i, event in enumerate(session.events):
+            match_pos = (event.content or "").lower().find(query_lower)
+            if match_pos >= 0:
+                matches.append((i, match_pos))
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    @staticmethod
+    def _paginate_events(
+        events: list[TimelineEvent],
+        event_types: list[str] | None,
+        offset: int,
+        limit: int,
+    ) -> tuple[list[TimelineEvent], int]:
+        """Filter events by type and slice out one page in a single pass."""
+        if not event_types:
+            return events[offset:offset + limit], len(events)
+
+        wanted = frozenset(event_types)
+        page = []
+        total = 0
+        for event in events:
+            if event.type not in wanted:
+                continue
+            if offset <= total < offset + limit:
+                page.append(event)
+            total += 1
+
+        return page, total
+
+    def get_file_changes(self, session_id: str) -> dict[str, list[FileChange]] | None:
+        """Get a session's file changes grouped by file path.
+
+        Results are cached and revalidated against the session file's mtime,
+        so repeat lookups skip loading and re-walking the session events.
+
+        Returns:
+            Dict mapping file path to its changes, or None if session not found
+        """
+        cache_key = f"file_changes:{session_id}"
+        changes = self._get_file_cached(self._session_cache, cache_key)
+        if changes is not None:
+            return changes
+
+        session = self.get_session_by_id(session_id)
+        if not session:
+            return None
+
+        changes = group_file_changes(extract_file_changes(session))
+        self._set_file_cached(self._session_cache, cache_key, session.file_path, changes)
+        return changes
+
+    def get_session_json(
+        self,
+        session_id: str,
+        include_thinking: bool = False
+    ) -> tuple[bytes, str] | None:
+        """Get a session serialized as JSON bytes, with its source file path.
+
+        The serialized payload is cached and revalidated against the session
+        file's mtime, so repeat exports skip model_dump and encoding entirely.
+
+        Returns:
+            (JSON-encoded SessionDetail, JSONL file path), or None if session
+            not found
+        """
+        cache_key = f"session_json:{session_id}:{include_thinking}"
+        cached = self._get_file_cached(self._json_cache, cache_key)
+        if cached is not None:
+            return cached
+
+        session = self.get_session_by_id(session_id, include_thinking=include_thinking)
+        if not session:
+            return None
+
+        payload = orjson.dumps(session.model_dump(), option=ORJSON_OPTIONS)
+        self._set_file_cached(
+            self._json_cache, cache_key, session.file_path, (payload, session.file_path),
+            len(payload),
+        )
+        return payload, session.file_path
+
+    def _get_file_cached(self, cache, cache_key: str):
+        """Return a cached value if its source file's mtime is unchanged."""
+        with self._cache_lock:
+            cached = cache.get(cache_key)
+        if cached:
+            file_path, mtime_ns, value, _ = cached
+            try:
+                if Path(file_path).stat().st_mtime_ns == mtime_ns:
+                    return value
+            except OSError:
+                pass
+        return None
+
+    def _set_file_cached(
+        self, cache, cache_key: str, file_path: str, value, size: int | None = None
+    ) -> None:
+        """Cache a value derived from file_path, tagged with the file's mtime.
+
+        size is what the entry counts against a size-bounded cache, defaulting
+        to the file's size; values larger than the whole cache aren't stored.
+        """
+        try:
+            stat = Path(file_path).stat()
+        except OSError:
+            return
+        entry = (file_path, stat.st_mtime_ns, value, stat.st_size if size is None else size)
+        with self._cache_lock:
+            if cache.getsizeof(entry) <= cache.maxsize:
+                cache[cache_key] = entry
+
     def clear_cache(self):
         """Clear the session cache and sync new/stale sessions.
 
         When SQLite is enabled, this also triggers an incremental sync
         to pick up new sessions and detect file modifications.
         """
-        self._cache.clear()
+        with self._cache_lock:
+            self._cache.clear()
+            self._session_cache.clear()
+            self._json_cache.clear()
+            self._timeline_cache.clear()
 
         # Trigger incremental sync if SQLite is enabled
         if self.db:
@@ -415,5 +768,19 @@ class SessionIndexer:
         return self.db.repair_fts5_if_needed()
 
 
-# Global instance
-session_indexer = SessionIndexer()
+# Process-wide instance, created on first use rather than at import: spawned
+# parser processes re-import the main module (app.mcp_server under
+# python -m), and must not build an indexer or sync the index there
+_session_indexer: SessionIndexer | None = None
+_session_indexer_lock = threading.Lock()
+
+
+def get_session_indexer() -> SessionIndexer:
+    """Get the shared SessionIndexer, creating it on first call."""
+    global _session_indexer
+
+    if _session_indexer is None:
+        with _session_indexer_lock:
+            if _session_indexer is None:
+                _session_indexer = SessionIndexer()
+    return _session_indexer
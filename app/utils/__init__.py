@@ -1,6 +1,7 @@
 """Utility functions for the application."""
 
+from app.utils.orjson_response import ORJSON_OPTIONS, ORJSONResponse
 from app.utils.paths import decode_project_path
 from app.utils.text import truncate_text
 
-__all__ = ["decode_project_path", "truncate_text"]
+__all__ = ["ORJSON_OPTIONS", "ORJSONResponse", "decode_project_path", "truncate_text"]
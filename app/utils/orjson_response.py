@@ -0,0 +1,23 @@
+"""JSON response class backed by orjson."""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import Response
+
+# Shared by the response class and anything that pre-serializes response bodies
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+class ORJSONResponse(Response):
+    """JSON response rendered with orjson instead of the stdlib json module.
+
+    orjson serializes datetimes natively, so handlers can pass plain
+    ``model_dump()`` output without a ``mode="json"`` conversion pass.
+    UTC datetimes are rendered with a ``Z`` suffix to match Pydantic.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
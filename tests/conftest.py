@@ -0,0 +1,76 @@
+"""Shared fixtures.
+
+Settings are read from the environment when app.config is first imported, so
+every data path is pointed at a throwaway directory before any app module is
+loaded.
+"""
+
+import os
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+_data_dir = Path(tempfile.mkdtemp(prefix="claude-log-converter-tests-"))
+os.environ["CLAUDE_LOG_CLAUDE_PROJECTS_DIR"] = str(_data_dir / "projects")
+os.environ["CLAUDE_LOG_UPLOAD_DIR"] = str(_data_dir / "uploads")
+os.environ["CLAUDE_LOG_DB_PATH"] = str(_data_dir / "sessions.db")
+os.environ["CLAUDE_LOG_BOOKMARK_DB_PATH"] = str(_data_dir / "bookmarks.db")
+
+import pytest  # noqa: E402
+
+from app.models.session import SessionDetail, SessionSummary, TimelineEvent  # noqa: E402
+from app.services.database import get_db_connection, init_database  # noqa: E402
+from app.services.session_db import SessionDatabase  # noqa: E402
+
+BASE_TIME = datetime(2025, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def session_db(tmp_path):
+    """An empty sessions index."""
+    db = SessionDatabase(tmp_path / "sessions.db")
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def add_session(session_db, tmp_path):
+    """Write a session straight into the index, bypassing JSONL parsing."""
+
+    def add(
+        session_id: str,
+        start_time: datetime | None = BASE_TIME,
+        project_name: str = "proj",
+        file_name: str | None = None,
+        contents: tuple[str, ...] = (),
+    ) -> SessionSummary:
+        file_path = tmp_path / (file_name or f"{session_id}.jsonl")
+        fields = {
+            "session_id": session_id,
+            "project_path": f"/work/{project_name}",
+            "project_name": project_name,
+            "file_path": str(file_path),
+            "start_time": start_time,
+            "end_time": start_time + timedelta(minutes=5) if start_time else None,
+        }
+        summary = SessionSummary(**fields, message_count=len(contents))
+        detail = SessionDetail(
+            **fields,
+            events=[
+                TimelineEvent(id=f"{session_id}-{i}", type="user", content=content)
+                for i, content in enumerate(contents)
+            ],
+        )
+        with session_db._get_connection(write=True) as conn:
+            session_db._write_session(conn, file_path, summary, detail, 0)
+        return summary
+
+    return add
+
+
+@pytest.fixture
+def bookmark_db():
+    """The bookmarks database, emptied before each test."""
+    init_database()
+    with get_db_connection() as conn:
+        conn.execute("DELETE FROM bookmarks")
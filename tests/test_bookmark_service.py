@@ -0,0 +1,172 @@
+"""Tests for bookmark storage, counts and the list cache."""
+
+import sqlite3
+
+import pytest
+
+from app.config import settings
+from app.models.bookmark import BookmarkCreate, BookmarkUpdate
+from app.services import bookmark_service
+from app.services.database import get_db_connection, get_read_connection
+
+pytestmark = pytest.mark.usefixtures("bookmark_db")
+
+
+def _create(session_id="s1", event_id="e1", project_name="proj", category="general"):
+    with get_db_connection() as conn:
+        return bookmark_service.create_bookmark(
+            conn,
+            BookmarkCreate(
+                session_id=session_id,
+                event_id=event_id,
+                event_index=0,
+                project_name=project_name,
+                category=category,
+            ),
+        )
+
+
+def _counts():
+    """bookmark_counts rows next to the same counts computed from bookmarks."""
+    with get_read_connection() as conn:
+        stored = conn.execute(
+            "SELECT session_id, project_name, category, n FROM bookmark_counts ORDER BY 1, 2, 3"
+        ).fetchall()
+        expected = conn.execute("""
+            SELECT session_id, COALESCE(project_name, ''), COALESCE(category, ''), COUNT(*)
+            FROM bookmarks
+            GROUP BY 1, 2, 3
+            ORDER BY 1, 2, 3
+        """).fetchall()
+    return [tuple(row) for row in stored], [tuple(row) for row in expected]
+
+
+# bookmark_counts
+
+
+def test_counts_after_insert():
+    _create(event_id="e1")
+    _create(event_id="e2")
+    _create(event_id="e3", project_name=None, category="todo")
+
+    stored, expected = _counts()
+    assert stored == expected
+    assert stored == [("s1", "", "todo", 1), ("s1", "proj", "general", 2)]
+
+
+def test_counts_after_category_update():
+    bookmark = _create(event_id="e1")
+    _create(event_id="e2")
+    with get_db_connection() as conn:
+        bookmark_service.update_bookmark(conn, bookmark.id, BookmarkUpdate(category="todo"))
+
+    stored, expected = _counts()
+    assert stored == expected
+    assert stored == [("s1", "proj", "general", 1), ("s1", "proj", "todo", 1)]
+
+
+def test_counts_drop_empty_rows_after_update():
+    bookmark = _create(event_id="e1")
+    with get_db_connection() as conn:
+        bookmark_service.update_bookmark(conn, bookmark.id, BookmarkUpdate(category="todo"))
+
+    stored, expected = _counts()
+    assert stored == expected == [("s1", "proj", "todo", 1)]
+
+
+def test_counts_after_delete():
+    first = _create(session_id="s1", event_id="e1")
+    _create(session_id="s1", event_id="e2")
+    _create(session_id="s2", event_id="e1")
+    with get_db_connection() as conn:
+        bookmark_service.delete_bookmark(conn, first.id)
+
+    stored, expected = _counts()
+    assert stored == expected
+    assert stored == [("s1", "proj", "general", 1), ("s2", "proj", "general", 1)]
+
+    with get_db_connection() as conn:
+        bookmark_service.delete_session_bookmarks(conn, "s1")
+
+    stored, expected = _counts()
+    assert stored == expected == [("s2", "proj", "general", 1)]
+
+
+def test_counts_after_recreate():
+    bookmark = _create(event_id="e1", category="general")
+    with get_db_connection() as conn:
+        bookmark_service.delete_bookmark(conn, bookmark.id)
+    _create(event_id="e1", category="todo")
+
+    stored, expected = _counts()
+    assert stored == expected == [("s1", "proj", "todo", 1)]
+
+
+def test_counts_unchanged_by_duplicate():
+    _create(event_id="e1")
+    with pytest.raises(bookmark_service.DuplicateBookmarkError):
+        _create(event_id="e1")
+
+    stored, expected = _counts()
+    assert stored == expected == [("s1", "proj", "general", 1)]
+
+
+def test_list_total_uses_counts():
+    for i in range(3):
+        _create(event_id=f"e{i}", category="todo" if i else "general")
+
+    with get_read_connection() as conn:
+        _, total = bookmark_service.list_bookmarks(conn, category="todo")
+    assert total == 2
+
+
+# list_bookmarks cache
+
+
+def test_list_cache_sees_own_writes():
+    with get_read_connection() as conn:
+        assert bookmark_service.list_bookmarks(conn) == ([], 0)
+
+    _create(event_id="e1")
+
+    with get_read_connection() as conn:
+        bookmarks, total = bookmark_service.list_bookmarks(conn)
+    assert [b.event_id for b in bookmarks] == ["e1"]
+    assert total == 1
+
+
+def test_list_cache_sees_other_connection_writes():
+    _create(event_id="e1")
+    with get_read_connection() as conn:
+        assert bookmark_service.list_bookmarks(conn)[1] == 1
+
+    # Another process (e.g. the MCP server) writing to the same database
+    with sqlite3.connect(settings.bookmark_db_path) as other:
+        other.execute(
+            "INSERT INTO bookmarks (session_id, event_id, event_index) VALUES ('s1', 'e2', 1)"
+        )
+    other.close()
+
+    with get_read_connection() as conn:
+        bookmarks, total = bookmark_service.list_bookmarks(conn)
+    assert sorted(b.event_id for b in bookmarks) == ["e1", "e2"]
+    assert total == 2
+
+
+# create_bookmarks_bulk
+
+
+def test_bulk_create_skips_existing_and_keeps_order():
+    existing = _create(event_id="e2")
+    items = [
+        BookmarkCreate(session_id="s1", event_id=f"e{i}", event_index=i, project_name="proj")
+        for i in (3, 2, 1)
+    ]
+    with get_db_connection() as conn:
+        bookmarks = bookmark_service.create_bookmarks_bulk(conn, items)
+
+    assert [b.event_id for b in bookmarks] == ["e3", "e2", "e1"]
+    assert bookmarks[1] == existing
+
+    stored, expected = _counts()
+    assert stored == expected == [("s1", "proj", "general", 3)]
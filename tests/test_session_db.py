@@ -0,0 +1,273 @@
+"""Tests for the SQLite sessions index."""
+
+from datetime import timedelta
+
+import pytest
+
+from app.models.session import SessionDetail, SessionSummary, TimelineEvent
+from app.services import session_db as session_db_module
+from app.services.session_db import (
+    build_fts5_query,
+    decode_session_cursor,
+    encode_session_cursor,
+)
+from tests.conftest import BASE_TIME
+
+# build_fts5_query
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("auth", '"auth"*'),
+        ("auth valid", '"auth" "valid"*'),
+        ("  spaced   out  ", '"spaced" "out"*'),
+        ('say "hi"', '"say" """hi"""*'),
+        ("fn(x) -flag a*b", '"fn(x)" "-flag" "a*b"*'),
+        ("OR NOT AND", '"OR" "NOT" "AND"*'),
+        ("", '""'),
+        ("   ", '""'),
+    ],
+)
+def test_build_fts5_query(query, expected):
+    assert build_fts5_query(query) == expected
+
+
+@pytest.mark.parametrize(
+    "query",
+    ['say "hi"', "fn(x)", "-flag", "a*b", "OR", "NEAR(a b)", "col:value", "^start", '"'],
+)
+def test_build_fts5_query_is_valid_fts5(session_db, add_session, query):
+    add_session("s1", contents=("plain text",))
+    # Syntax characters are quoted, so MATCH never raises
+    sessions, total = session_db.get_sessions(search=query)
+    assert (sessions, total) == ([], 0)
+
+
+def test_build_fts5_query_matches_prefix(session_db, add_session):
+    add_session("s1", contents=("refactor the authentication module",))
+    add_session("s2", contents=("unrelated",))
+
+    sessions, total = session_db.get_sessions(search="the authen")
+    assert [s.session_id for s in sessions] == ["s1"]
+    assert total == 1
+
+
+# Session cursors
+
+
+def test_session_cursor_round_trip(add_session):
+    summary = add_session("abc", start_time=BASE_TIME)
+    assert decode_session_cursor(encode_session_cursor(summary)) == (
+        BASE_TIME.isoformat(),
+        "abc",
+    )
+
+
+def test_session_cursor_without_start_time(add_session):
+    summary = add_session("abc", start_time=None)
+    assert encode_session_cursor(summary) == "|abc"
+    assert decode_session_cursor("|abc") == (None, "abc")
+
+
+@pytest.mark.parametrize("cursor", ["", "no-separator", "2025-01-01T00:00:00|", "not-a-date|abc"])
+def test_decode_session_cursor_rejects_malformed(cursor):
+    with pytest.raises(ValueError):
+        decode_session_cursor(cursor)
+
+
+@pytest.fixture
+def paged_sessions(add_session):
+    """Sessions with distinct, tied and missing start times across two projects."""
+    for i in range(7):
+        add_session(f"a{i}", start_time=BASE_TIME + timedelta(hours=i), project_name="alpha")
+    for i in range(4):
+        # Tied start times, ordered by session_id
+        add_session(f"t{i}", start_time=BASE_TIME + timedelta(hours=3), project_name="beta")
+    for i in range(3):
+        add_session(f"n{i}", start_time=None, project_name="beta" if i % 2 else "alpha")
+
+
+@pytest.mark.parametrize("order", ["desc", "asc"])
+@pytest.mark.parametrize("project", [None, "alpha", "beta"])
+@pytest.mark.parametrize("limit", [1, 3, 5, 100])
+def test_cursor_pages_match_offset_pages(session_db, paged_sessions, order, project, limit):
+    expected, total = session_db.get_sessions(project=project, order=order, limit=100)
+    assert len(expected) == total
+
+    seen = []
+    cursor = None
+    while True:
+        page, _ = session_db.get_sessions(
+            project=project, order=order, limit=limit, cursor=cursor
+        )
+        seen.extend(page)
+        if len(page) < limit:
+            break
+        cursor = encode_session_cursor(page[-1])
+
+    assert [s.session_id for s in seen] == [s.session_id for s in expected]
+
+
+@pytest.mark.parametrize("exact_total", [True, False])
+def test_cursor_page_has_no_lookahead_row(session_db, paged_sessions, exact_total):
+    first, total = session_db.get_sessions(order="desc", limit=2)
+    page, page_total = session_db.get_sessions(
+        order="desc", limit=3, exact_total=exact_total, cursor=encode_session_cursor(first[-1])
+    )
+    assert len(page) == 3
+    assert page_total == (total if exact_total else 3)
+
+
+def test_cursor_after_last_session_is_empty(session_db, paged_sessions):
+    sessions, _ = session_db.get_sessions(order="desc", limit=100)
+    page, _ = session_db.get_sessions(
+        order="desc", limit=10, cursor=encode_session_cursor(sessions[-1])
+    )
+    assert page == []
+
+
+# meta.session_count
+
+
+def _count_matches_meta(session_db) -> bool:
+    with session_db._get_connection() as conn:
+        actual = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        return session_db._session_count(conn) == actual
+
+
+def test_session_count_after_insert(session_db, add_session):
+    for i in range(3):
+        add_session(f"s{i}")
+    assert session_db.get_indexed_session_count() == 3
+    assert _count_matches_meta(session_db)
+
+
+def test_session_count_after_reindex(session_db, add_session):
+    add_session("s1", contents=("first",))
+    add_session("s1", contents=("second", "third"))
+
+    assert session_db.get_indexed_session_count() == 1
+    assert _count_matches_meta(session_db)
+    with session_db._get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 2
+
+
+def test_session_count_after_session_id_change(session_db, add_session):
+    # Same file re-indexed under a new session ID replaces the old row
+    add_session("old", file_name="shared.jsonl", contents=("a",))
+    add_session("other")
+    add_session("new", file_name="shared.jsonl", contents=("b",))
+
+    sessions, total = session_db.get_sessions(limit=100)
+    assert sorted(s.session_id for s in sessions) == ["new", "other"]
+    assert total == 2
+    assert _count_matches_meta(session_db)
+    with session_db._get_connection() as conn:
+        orphans = conn.execute(
+            "SELECT COUNT(*) FROM events WHERE session_id = 'old'"
+        ).fetchone()[0]
+    assert orphans == 0
+
+
+def test_session_count_after_delete(session_db, add_session):
+    for i in range(3):
+        add_session(f"s{i}")
+    with session_db._get_connection(write=True) as conn:
+        conn.execute("DELETE FROM sessions WHERE session_id = 's1'")
+
+    assert session_db.get_indexed_session_count() == 2
+    assert _count_matches_meta(session_db)
+
+    session_db.clear_index()
+    assert session_db.get_indexed_session_count() == 0
+    assert _count_matches_meta(session_db)
+
+
+def test_session_count_with_recursive_triggers_off(session_db, add_session):
+    add_session("s1")
+    with session_db._get_connection() as conn:
+        conn.execute("PRAGMA recursive_triggers=OFF")
+    add_session("s1")
+    add_session("s2", file_name="s1.jsonl")
+
+    assert session_db.get_indexed_session_count() == 1
+    assert _count_matches_meta(session_db)
+
+
+# rebuild_index
+
+
+@pytest.fixture
+def projects_dir(tmp_path):
+    project = tmp_path / "projects" / "-work-proj"
+    project.mkdir(parents=True)
+    for session_id in ("new1", "new2"):
+        (project / f"{session_id}.jsonl").touch()
+    return tmp_path / "projects"
+
+
+def _parsed(file_path, contents):
+    fields = {
+        "session_id": file_path.stem,
+        "project_path": "/work/proj",
+        "project_name": "proj",
+        "file_path": str(file_path),
+        "start_time": BASE_TIME,
+    }
+    events = [TimelineEvent(id=f"{file_path.stem}-0", type="user", content=contents)]
+    return SessionSummary(**fields), SessionDetail(**fields, events=events), 0
+
+
+def _session_ids(session_db, search=None):
+    sessions, total = session_db.get_sessions(search=search, limit=100)
+    assert len(sessions) == total
+    return sorted(s.session_id for s in sessions)
+
+
+def test_rebuild_keeps_old_index_until_swap(session_db, add_session, projects_dir, monkeypatch):
+    add_session("old", contents=("stale words",))
+    seen = []
+    write_batch = session_db._write_rebuild_batch
+
+    def checked_write_batch(batch):
+        count = write_batch(batch)
+        seen.append((_session_ids(session_db), _session_ids(session_db, "stale")))
+        return count
+
+    monkeypatch.setattr(session_db_module, "REBUILD_BATCH_SIZE", 1)
+    monkeypatch.setattr(
+        session_db_module,
+        "_parsed_for_index",
+        lambda jobs: (_parsed(file_path, "fresh words") for file_path, _, _ in jobs),
+    )
+    monkeypatch.setattr(session_db, "_write_rebuild_batch", checked_write_batch)
+
+    assert session_db.rebuild_index(projects_dir) == 2
+    assert seen == [(["old"], ["old"])] * 2
+    assert _session_ids(session_db) == ["new1", "new2"]
+    assert _session_ids(session_db, "fresh") == ["new1", "new2"]
+    assert _session_ids(session_db, "stale") == []
+    assert _count_matches_meta(session_db)
+
+
+def test_failed_rebuild_keeps_old_index(session_db, add_session, projects_dir, monkeypatch):
+    add_session("old", contents=("stale words",))
+
+    def failing(jobs):
+        yield _parsed(jobs[0][0], "fresh words")
+        raise RuntimeError("parse pool died")
+
+    monkeypatch.setattr(session_db_module, "REBUILD_BATCH_SIZE", 1)
+    monkeypatch.setattr(session_db_module, "_parsed_for_index", failing)
+
+    with pytest.raises(RuntimeError):
+        session_db.rebuild_index(projects_dir)
+
+    assert _session_ids(session_db, "stale") == ["old"]
+    assert _count_matches_meta(session_db)
+    with session_db._get_connection() as conn:
+        leftover = conn.execute(
+            "SELECT name FROM sqlite_master WHERE name LIKE 'rebuild\\_%' ESCAPE '\\'"
+        ).fetchall()
+    assert leftover == []